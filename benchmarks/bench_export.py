@@ -0,0 +1,48 @@
+# Scaling of the parallel export (heart_export.py) with the number of worker
+# processes: renders the same beat cycles with 1, 2, 4, ... workers up to the
+# core count and reports frames/sec and the speedup over one worker. The
+# speedup should stay close to the worker count while there are cores to
+# spare.
+#
+#   python benchmarks/bench_export.py [--bpm-min 130 --bpm-max 150] [--max-workers N]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import heart_export
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel export scaling benchmark")
+    parser.add_argument("--bpm-min", type=int, default=130, help="lowest BPM to export")
+    parser.add_argument("--bpm-max", type=int, default=150, help="highest BPM to export")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count(), help="largest pool to try")
+    args = parser.parse_args()
+
+    counts = [1]
+    while counts[-1] * 2 <= args.max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+
+    if args.max_workers > (os.cpu_count() or 1):
+        print(f"note: only {os.cpu_count()} core(s); speedups past that are not meaningful")
+    print(f"{'workers':>8} {'frames':>8} {'seconds':>8} {'frames/s':>9} {'speedup':>8}")
+    baseline = None
+    for workers in counts:
+        with tempfile.TemporaryDirectory() as output:
+            started = time.perf_counter()
+            frames = heart_export.export("beats", output, workers, fmt="ppm", bpm_min=args.bpm_min,
+                                         bpm_max=args.bpm_max, log=lambda message: None)
+            elapsed = time.perf_counter() - started
+        if baseline is None:
+            baseline = elapsed
+        print(f"{workers:>8} {frames:>8} {elapsed:>8.2f} {frames / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
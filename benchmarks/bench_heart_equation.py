@@ -0,0 +1,78 @@
+# Micro-benchmark: the original per-point heart2 curve loop vs the
+# precomputed HeartEquationGrid, for growing step counts. The scalar
+# baseline is a copy of heart2's code before the rewrite (a method call and
+# a bare try/except per point), so the speedup is against what was replaced.
+#
+#   python benchmarks/bench_heart_equation.py [--repeat N] [--k K]
+import argparse
+import math
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import heart_curves
+
+STEPS = [300, 1000, 3000, 10000, 30000, 100000]
+
+
+class OriginalHeart:
+    """heart2.HeartAnimation's curve code as it was before the rewrite"""
+
+    def heart_equation(self, x, k):
+        """Calculate y value for heart equation"""
+        try:
+            if 3 - x**2 < 0:
+                return None
+            y = abs(x)**(2/3) + 0.9 * math.sin(k * x) * math.sqrt(3 - x**2)
+            return y
+        except:
+            return None
+
+    def collect_points(self, k, steps):
+        x_values = []
+        y_values = []
+        for i in range(steps + 1):
+            x = -1.8 + (3.6 * i / steps)
+            y = self.heart_equation(x, k)
+            if y is not None:
+                x_values.append(x * 100)
+                y_values.append(y * 100)
+        return x_values, y_values
+
+
+def scalar_curve(k, steps, original=OriginalHeart()):
+    """The original per-point path: one heart_equation call per x value"""
+    return original.collect_points(k, steps)
+
+
+def grid_curve(k, steps):
+    """The separable path: grid factors are cached, only sin(kx) is evaluated"""
+    return heart_curves.equation_grid(steps).coords(k, 100)
+
+
+def best_of(func, repeat):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="heart_equation micro-benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--k", type=float, default=20.75)
+    args = parser.parse_args()
+    
+    backend = "numpy" if heart_curves.np is not None else "pure python"
+    print(f"heart_equation, k = {args.k}, backend: {backend}")
+    print(f"{'steps':>8} {'scalar ms':>11} {'grid ms':>9} {'speedup':>8}")
+    for steps in STEPS:
+        heart_curves.equation_grid(steps)  # grid setup is paid once per steps
+        scalar = best_of(lambda: scalar_curve(args.k, steps), args.repeat)
+        grid = best_of(lambda: grid_curve(args.k, steps), args.repeat)
+        print(f"{steps:>8} {scalar * 1e3:>11.3f} {grid * 1e3:>9.3f} {scalar / grid:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Live BPM input (heart1.py --bpm-socket / --bpm-fifo): how many readings
+# per second the asyncio run mode keeps up with. For each rate a sender
+# process (heart_live.py) streams timestamped readings while BeatingHeart
+# runs on asyncio through the recording Tk fakes in fakes.py. Reported per
+# rate: readings sent and received, the frame rate held, the frame time,
+# and the send-to-display latency of the readings that were applied. A rate
+# is sustainable when nothing is lost, the frame rate holds and p99
+# latency stays within two frame times.
+#
+#   python benchmarks/bench_live.py [--rates 10 100 1000 10000] [--fifo]
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import fakes
+import heart1
+from heart_live import LiveBpm, percentile
+
+fakes.install(heart1)
+
+
+async def bench_rate(rate, duration, fps, fifo):
+    """Run BeatingHeart on live input at `rate` readings/s for `duration` seconds"""
+    app = heart1.BeatingHeart(fps=fps)
+    draw_frame = app.draw_frame
+    frame_times = []
+
+    def timed_frame():
+        started = time.perf_counter()
+        draw_frame()
+        frame_times.append(time.perf_counter() - started)
+
+    app.draw_frame = timed_frame
+    live = LiveBpm()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bpm")
+        await live.listen(None if fifo else path, path if fifo else None)
+        target = "--fifo" if fifo else "--socket"
+        sender = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.join(ROOT, "heart_live.py"), target, path,
+            "--rate", str(rate), "--duration", str(duration),
+            stdout=subprocess.PIPE)
+        started = time.perf_counter()
+        run = asyncio.ensure_future(app.run_async(live))
+        output, _ = await sender.communicate()
+        await asyncio.sleep(0.2)  # let the last readings arrive and be drawn
+        run.cancel()
+        await asyncio.gather(run, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        await live.close()
+    app.root.pending.clear()
+    sent = int(output.split()[-1])
+    return sent, live, len(frame_times) / elapsed, frame_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sustainable live BPM update rate")
+    parser.add_argument("--rates", type=float, nargs="+", default=[10, 100, 1000, 10000, 50000], help="readings per second to try")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per rate")
+    parser.add_argument("--fps", type=int, default=20, help="target frame rate")
+    parser.add_argument("--fifo", action="store_true", help="send through a FIFO instead of a Unix socket")
+    args = parser.parse_args()
+
+    budget = 1.0 / args.fps
+    print(f"{'rate/s':>8} {'sent':>8} {'received':>8} {'fps':>6} {'frame p99':>10} "
+          f"{'lat p50':>8} {'lat p99':>8} {'lat max':>8}")
+    sustainable = None
+    for rate in args.rates:
+        sent, live, fps, frame_times = asyncio.run(bench_rate(rate, args.duration, args.fps, args.fifo))
+        latencies = live.latencies or [float("nan")]
+        p99 = percentile(latencies, 0.99)
+        ok = live.received == sent and fps >= 0.9 * args.fps and p99 <= 2 * budget
+        if ok:
+            sustainable = rate
+        print(f"{rate:>8g} {sent:>8} {live.received:>8} {fps:>6.1f} {percentile(frame_times, 0.99) * 1e3:>8.2f}ms "
+              f"{percentile(latencies, 0.5) * 1e3:>6.1f}ms {p99 * 1e3:>6.1f}ms {max(latencies) * 1e3:>6.1f}ms"
+              f"  {'ok' if ok else 'over'}")
+    print(f"sustainable: {sustainable:g} readings/s" if sustainable else "sustainable: none of the rates")
+
+
+if __name__ == "__main__":
+    main()
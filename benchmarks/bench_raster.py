@@ -0,0 +1,90 @@
+# Offscreen rasterizer benchmark: renders the beat, curve and nested scenes
+# with heart_raster.RasterRenderer (no Tk, no fakes) and reports frames/sec,
+# Mpixels/sec and per-frame latency percentiles, including PNG encoding.
+#
+#   python benchmarks/bench_raster.py [--frames N] [--output results.json]
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import heart_raster
+from heart_live import percentile
+
+
+def bench_scene(name, frames, encode, **options):
+    """Render `frames` frames of a scene; latency covers drawing, rasterizing and encoding"""
+    width, height, background = heart_raster.SCENE_SIZES[name]
+    renderer = heart_raster.RasterRenderer(width, height, background)
+    latencies = []
+    scene = heart_raster.scene_frames(name, renderer, frames, **options)
+    while True:
+        started = time.perf_counter()
+        try:
+            next(scene)
+        except StopIteration:
+            break
+        rgb = renderer.frame()
+        if encode == "png":
+            heart_raster.encode_png(width, height, rgb)
+        latencies.append(time.perf_counter() - started)
+    total = sum(latencies)
+    label = " ".join(f"{key}={value}" for key, value in options.items())
+    return {
+        'name': f"{name} {label} encode={encode}".replace("  ", " "),
+        'params': dict(options, scene=name, encode=encode),
+        'frames': len(latencies),
+        'fps': len(latencies) / total if total else 0.0,
+        'mpixels_per_sec': len(latencies) * width * height / total / 1e6 if total else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.50) * 1e3,
+            'p90': percentile(latencies, 0.90) * 1e3,
+            'p99': percentile(latencies, 0.99) * 1e3,
+            'max': max(latencies) * 1e3,
+        },
+    }
+
+
+def run_suite(frames):
+    results = []
+    for encode in ("raw", "png"):
+        results.append(bench_scene("beat", frames, encode, bpm=72))
+        results.append(bench_scene("beat", frames, encode, bpm=150))
+        results.append(bench_scene("curve", frames, encode, k=1.0, k_stop=50.0))
+        results.append(bench_scene("curve", frames, encode, k=1.0, k_stop=50.0, rainbow=True))
+        results.append(bench_scene("nested", max(1, frames // 10), encode))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offscreen rasterizer benchmark")
+    parser.add_argument("--frames", type=int, default=60, help="frames per scene")
+    parser.add_argument("--output", default="bench_raster_results.json", help="where to write the JSON results")
+    args = parser.parse_args()
+
+    results = run_suite(args.frames)
+    print(f"{'benchmark':<56} {'fps':>8} {'Mpix/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for row in results:
+        print(f"{row['name']:<56} {row['fps']:>8.1f} {row['mpixels_per_sec']:>8.2f} "
+              f"{row['latency_ms']['p50']:>8.3f} {row['latency_ms']['p99']:>8.3f}")
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': heart_raster.np is not None,
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
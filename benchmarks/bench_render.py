@@ -0,0 +1,229 @@
+# Headless benchmark of the render and animation hot paths:
+# BeatingHeart.animate, BeatScene.draw_heart, HeartAnimation.draw_heart and
+# animate_step, driven through the recording fakes in fakes.py.
+#
+#   python benchmarks/bench_render.py [--quick] [--output results.json]
+#                                     [--compare baseline.json --threshold 0.25]
+#
+# Reports vertices/sec, Tk calls per frame, frames/sec and per-frame latency
+# percentiles for a matrix of BPM, wave counts, k, steps, rainbow and glow.
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakes
+import heart1
+import heart2
+import heart_curves
+import heart_scheduler
+from heart_live import percentile
+from heart_quality import QUALITY_LEVELS
+
+fakes.install(heart1, heart2)
+
+
+def summarize(name, params, latencies, calls, vertices):
+    """One result row; latencies are seconds per frame"""
+    total = sum(latencies)
+    frames = len(latencies)
+    return {
+        'name': name,
+        'params': params,
+        'frames': frames,
+        'fps': frames / total if total else 0.0,
+        'vertices_per_sec': vertices / total if total else 0.0,
+        'tk_calls_per_frame': calls / frames,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.50) * 1e3,
+            'p90': percentile(latencies, 0.90) * 1e3,
+            'p99': percentile(latencies, 0.99) * 1e3,
+            'max': max(latencies) * 1e3,
+        },
+    }
+
+
+def simulated_clock():
+    """Make the animation clock advance only when the benchmark says so"""
+    clock = fakes.SimulatedTime(1000.0)
+    heart1.time = clock
+    heart_scheduler.time = clock
+    return clock
+
+
+def restore_clock():
+    heart1.time = time
+    heart_scheduler.time = time
+
+
+def bench_beating_heart(bpm, waves, sampling, frames, fps=20, warmup_seconds=3.0):
+    """BeatingHeart.animate at a fixed BPM with up to `waves` pulse waves in flight"""
+    clock = simulated_clock()
+    try:
+        # Enough echoes per beat to fill the wave capacity at 72 BPM
+        app = heart1.BeatingHeart(fps=fps, adaptive=False, sampling=sampling,
+                                  wave_capacity=waves, echoes=max(1, waves // 6))
+        app.bpm_var.set(bpm)
+        app.root.pending.clear()
+
+        # Reach the steady state where waves are in flight
+        for _ in range(int(warmup_seconds * fps)):
+            clock.advance(1.0 / fps)
+            app.animate()
+
+        fakes.counter.reset()
+        latencies = []
+        for _ in range(frames):
+            clock.advance(1.0 / fps)
+            started = time.perf_counter()
+            app.animate()
+            latencies.append(time.perf_counter() - started)
+        app.root.pending.clear()
+    finally:
+        restore_clock()
+    params = {'bpm': bpm, 'waves': waves, 'sampling': sampling, 'fps': fps}
+    name = f"BeatingHeart.animate bpm={bpm} waves={waves} sampling={sampling}"
+    return summarize(name, params, latencies, fakes.counter.calls, fakes.counter.vertices)
+
+
+def bench_draw_heart(scale, sampling, frames):
+    """BeatScene.draw_heart for one heart at a fixed scale"""
+    app = heart1.BeatingHeart(adaptive=False, sampling=sampling)
+    app.root.pending.clear()
+    color = app.scene.get_pulse_color(1.0)
+    fakes.counter.reset()
+    latencies = []
+    for _ in range(frames):
+        # Forget what was pushed last frame, or the renderer skips the redraw
+        app.renderer.drawn.clear()
+        started = time.perf_counter()
+        app.scene.draw_heart("main", scale, color, 4)
+        latencies.append(time.perf_counter() - started)
+    params = {'scale': scale, 'sampling': sampling}
+    name = f"BeatScene.draw_heart scale={scale} sampling={sampling}"
+    return summarize(name, params, latencies, fakes.counter.calls, fakes.counter.vertices)
+
+
+def new_heart_animation(sampling, steps, rainbow, glow):
+    app = heart2.HeartAnimation(adaptive=False, sampling=sampling)
+    app.governor.levels = [dict(QUALITY_LEVELS[0], curve_steps=steps)]
+    app.scene.rainbow_mode = rainbow
+    app.scene.glow_enabled = glow
+    app.root.pending.clear()
+    return app
+
+
+def bench_equation_draw(k, sampling, steps, rainbow, glow, frames):
+    """HeartAnimation.draw_heart with a cold geometry cache every frame"""
+    app = new_heart_animation(sampling, steps, rainbow, glow)
+    fakes.counter.reset()
+    latencies = []
+    for _ in range(frames):
+        app.scene.geometry_cache.clear()
+        app.renderer.drawn.clear()
+        started = time.perf_counter()
+        app.draw_heart(k)
+        latencies.append(time.perf_counter() - started)
+    params = {'k': k, 'sampling': sampling, 'steps': steps, 'rainbow': rainbow, 'glow': glow}
+    name = f"HeartAnimation.draw_heart k={k} sampling={sampling} steps={steps} rainbow={rainbow} glow={glow}"
+    return summarize(name, params, latencies, fakes.counter.calls, fakes.counter.vertices)
+
+
+def bench_playback(k, rainbow, glow):
+    """One full HeartAnimation playback, timing every animate_step"""
+    app = new_heart_animation("uniform", 300, rainbow, glow)
+    app.k_value = k
+    fakes.counter.reset()
+    latencies = []
+    started = time.perf_counter()
+    app.play_animation()
+    latencies.append(time.perf_counter() - started)
+    while app.is_playing and app.root.pending:
+        _, func, args = app.root.pending.pop(0)
+        started = time.perf_counter()
+        func(*args)
+        latencies.append(time.perf_counter() - started)
+    params = {'k': k, 'rainbow': rainbow, 'glow': glow}
+    name = f"HeartAnimation.animate_step k={k} rainbow={rainbow} glow={glow}"
+    return summarize(name, params, latencies, fakes.counter.calls, fakes.counter.vertices)
+
+
+def run_suite(quick):
+    frames = 60 if quick else 300
+    bpms = [72] if quick else [40, 72, 150]
+    wave_counts = [4, 64] if quick else [4, 32, 256]
+    ks = [20.75] if quick else [1, 20.75, 50]
+    samplings = [("uniform", 300), ("adaptive", 300)] if quick else [("uniform", 300), ("uniform", 1000), ("adaptive", 300)]
+    flags = [(False, True), (True, True)] if quick else [(False, False), (False, True), (True, False), (True, True)]
+
+    results = []
+    for bpm in bpms:
+        for waves in wave_counts:
+            for sampling in ("uniform", "adaptive"):
+                results.append(bench_beating_heart(bpm, waves, sampling, frames))
+    for scale in (1.0, 2.0):
+        for sampling in ("uniform", "adaptive"):
+            results.append(bench_draw_heart(scale, sampling, frames))
+    for k in ks:
+        for sampling, steps in samplings:
+            for rainbow, glow in flags:
+                results.append(bench_equation_draw(k, sampling, steps, rainbow, glow, frames // 3))
+        for rainbow, glow in flags:
+            results.append(bench_playback(k, rainbow, glow))
+    return results
+
+
+def compare(results, baseline_path, threshold):
+    """Print regressions in p50 latency against an earlier run; returns their count"""
+    with open(baseline_path) as f:
+        baseline = {row['name']: row for row in json.load(f)['results']}
+    regressions = 0
+    for row in results:
+        old = baseline.get(row['name'])
+        if old is None:
+            continue
+        before = old['latency_ms']['p50']
+        after = row['latency_ms']['p50']
+        if before > 0 and after > before * (1 + threshold):
+            regressions += 1
+            print(f"REGRESSION {row['name']}: p50 {before:.3f} ms -> {after:.3f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless render benchmark")
+    parser.add_argument("--quick", action="store_true", help="small matrix for a fast check")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p50 slowdown before flagging (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = run_suite(args.quick)
+    print(f"{'benchmark':<92} {'fps':>9} {'Mvert/s':>8} {'calls/f':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for row in results:
+        print(f"{row['name']:<92} {row['fps']:>9.0f} {row['vertices_per_sec'] / 1e6:>8.2f} "
+              f"{row['tk_calls_per_frame']:>8.1f} {row['latency_ms']['p50']:>8.3f} {row['latency_ms']['p99']:>8.3f}")
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': heart_curves.np is not None,
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Frame time of the heart wall (heart_wall.py) against the number of hearts,
+# through the recording Tk fakes in fakes.py. Each frame is one
+# HeartWall.animate call: pulse sizes, vertices of the hearts that changed,
+# Canvas calls and the flush.
+#
+#   python benchmarks/bench_wall.py [--hearts 10 100 1000 3000] [--fps 30]
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakes
+import heart_scheduler
+import heart_wall
+from heart_live import percentile
+
+fakes.install(heart_wall)
+
+
+def bench_wall(hearts, fps, frames):
+    """Per-frame latencies of a wall of `hearts` hearts, after its first frame"""
+    clock = fakes.SimulatedTime(1000.0)
+    heart_wall.time = clock
+    heart_scheduler.time = clock
+    try:
+        app = heart_wall.HeartWall(hearts, fps, seed=1)
+        app.root.pending.clear()
+        fakes.counter.reset()
+        latencies = []
+        for _ in range(frames):
+            clock.advance(1.0 / fps)
+            started = time.perf_counter()
+            app.animate()
+            latencies.append(time.perf_counter() - started)
+        app.root.pending.clear()
+    finally:
+        heart_wall.time = time
+        heart_scheduler.time = time
+    return latencies, fakes.counter.calls / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Heart wall frame time vs number of hearts")
+    parser.add_argument("--hearts", type=int, nargs="+", default=[10, 100, 1000, 3000], help="wall sizes to measure")
+    parser.add_argument("--fps", type=int, default=30, help="target frame rate (sets the budget)")
+    parser.add_argument("--frames", type=int, default=150, help="frames per wall size")
+    args = parser.parse_args()
+
+    budget = 1000.0 / args.fps
+    print(f"{'hearts':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'calls/f':>8}  budget {budget:.1f} ms")
+    for hearts in args.hearts:
+        latencies, calls = bench_wall(hearts, args.fps, args.frames)
+        p99 = percentile(latencies, 0.99) * 1e3
+        print(f"{hearts:>7} {percentile(latencies, 0.5) * 1e3:>8.2f} {percentile(latencies, 0.9) * 1e3:>8.2f} "
+              f"{p99:>8.2f} {max(latencies) * 1e3:>8.2f} {calls:>8.0f}  {'ok' if p99 <= budget else 'over'}")
+
+
+if __name__ == "__main__":
+    main()
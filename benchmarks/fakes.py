@@ -0,0 +1,207 @@
+# Display-free stand-ins for tkinter and turtle that record what the apps
+# ask Tk to do. Install them with install(module) before constructing
+# BeatingHeart / HeartAnimation; nothing here needs an X server.
+import types
+
+
+class CallCounter:
+    """Counts Tk calls and the vertices pushed to the canvas"""
+
+    def __init__(self):
+        self.calls = 0
+        self.vertices = 0
+        self.by_name = {}
+
+    def record(self, name, vertices=0):
+        self.calls += 1
+        self.vertices += vertices
+        self.by_name[name] = self.by_name.get(name, 0) + 1
+
+    def reset(self):
+        self.calls = 0
+        self.vertices = 0
+        self.by_name = {}
+
+
+counter = CallCounter()
+
+
+class Widget:
+    """Accepts any widget call and records it"""
+
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = dict(options)
+
+    def cget(self, key):
+        return self.options.get(key, "")
+
+    def config(self, **options):
+        counter.record("config")
+        self.options.update(options)
+
+    configure = config
+
+    def set(self, value):
+        self.options["value"] = value
+
+    def __getattr__(self, name):
+        # pack, grid, bind, title, geometry, ...
+        def call(*args, **kwargs):
+            counter.record(name)
+        return call
+
+
+class Canvas(Widget):
+    """Canvas that keeps items in a dict and counts every call"""
+
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.items = {}
+        self.next_id = 1
+
+    def _create(self, kind, coords, options):
+        counter.record("create_" + kind, len(coords) // 2)
+        item = self.next_id
+        self.next_id += 1
+        self.items[item] = {'kind': kind, 'coords': list(coords), 'options': options}
+        return item
+
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+    def create_polygon(self, *coords, **options):
+        return self._create("polygon", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create("image", coords, options)
+
+    def coords(self, item, *coords):
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        counter.record("coords", len(coords) // 2)
+        self.items[item]['coords'] = list(coords)
+
+    def itemconfigure(self, item, **options):
+        counter.record("itemconfigure")
+        self.items[item]['options'].update(options)
+
+    itemconfig = itemconfigure
+
+    def delete(self, *items):
+        counter.record("delete")
+        for item in items:
+            if item == "all":
+                self.items.clear()
+            else:
+                self.items.pop(item, None)
+
+    def find_all(self):
+        return tuple(self.items)
+
+
+class Tk(Widget):
+    """Root window whose after() callbacks are queued, not run"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.pending = []
+
+    def after(self, ms, func=None, *args):
+        self.pending.append((ms, func, args))
+        return f"after#{len(self.pending)}"
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def run_next(self):
+        """Run the oldest queued callback; returns its delay or None"""
+        if not self.pending:
+            return None
+        ms, func, args = self.pending.pop(0)
+        func(*args)
+        return ms
+
+
+class Variable:
+    def __init__(self, master=None, value=None, **kwargs):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+tk = types.SimpleNamespace(
+    Tk=Tk, Canvas=Canvas, Label=Widget, Frame=Widget, Button=Widget,
+    Scale=Widget, Checkbutton=Widget,
+    IntVar=Variable, DoubleVar=Variable, StringVar=Variable, BooleanVar=Variable,
+    TclError=RuntimeError,
+    RAISED="raised", RIDGE="ridge", X="x", Y="y", BOTH="both", LEFT="left",
+    RIGHT="right", TOP="top", BOTTOM="bottom", HORIZONTAL="horizontal",
+    DISABLED="disabled", NORMAL="normal", HIDDEN="hidden", ROUND="round",
+)
+
+
+class RawTurtle:
+    """Turtle pen that only counts its calls"""
+
+    def __init__(self, screen=None, *args, **kwargs):
+        self.screen = screen
+
+    def goto(self, *position):
+        counter.record("goto", 1)
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            counter.record(name)
+        return call
+
+
+class TurtleScreen:
+    def __init__(self, canvas=None):
+        self.canvas = canvas
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            counter.record(name)
+        return call
+
+
+turtle = types.SimpleNamespace(RawTurtle=RawTurtle, Turtle=RawTurtle, TurtleScreen=TurtleScreen)
+
+
+class SimulatedTime:
+    """Stands in for the time module so animation time advances per frame"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def perf_counter(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def install(*modules):
+    """Point the modules' tk / turtle globals at the fakes"""
+    for module in modules:
+        if hasattr(module, "tk"):
+            module.tk = tk
+        if hasattr(module, "turtle"):
+            module.turtle = turtle
@@ -0,0 +1,162 @@
+# Soak test: run the apps for a very large number of simulated frames
+# through the recording Tk fakes in fakes.py and check that memory stays
+# bounded. Every app is exercised the way a kiosk would be over days (BPM
+# changes, start/stop, slider moves, playback, mode toggles, the F3
+# overlay) while the Python heap (tracemalloc), the number of Canvas items
+# and the renderer's item pools are sampled. Caches fill during the warm-up;
+# after it, anything that still grows fails the run (exit status 1).
+#
+# The warm-up is a fixed number of frames per app: long enough for the
+# exercise to visit every key the geometry caches can hold (each BPM, beating
+# and stopped; each k, plain and rainbow), after which heart2's cache sits at
+# its cap and only swaps entries. Memory then rises and falls with the
+# exercise cycle (rainbow on and off, for instance), so each half of what
+# follows must span at least one cycle for the halves to be comparable. The
+# default run is the warm-up plus four cycles, a few minutes per app; pass
+# --frames 1000000 or more for an overnight soak.
+#
+#   python benchmarks/soak.py [--apps heart1 heart2 wall] [--frames N] [--warmup N]
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakes
+import heart1
+import heart2
+import heart_scheduler
+import heart_wall
+
+fakes.install(heart1, heart2, heart_wall)
+
+
+# Frames for one pass over every BPM (heart1) and every k (heart2)
+BPM_SWEEP = 111 * 50
+K_SWEEP = 197 * 37
+# The F3 overlay is on for this many frames, then off as long
+OVERLAY_EVERY = 1000
+
+
+def exercise_heart1(app, frame):
+    if frame % 50 == 0:
+        app.bpm_var.set(40 + (frame // 50) % 111)
+    if frame % BPM_SWEEP == 0:
+        app.toggle_beat()
+    if frame % OVERLAY_EVERY == 0:
+        app.profiler.toggle_overlay()
+
+
+def exercise_heart2(app, frame):
+    if frame % 37 == 0:
+        app.update_k(1 + (frame // 37 * 7) % 197 * 0.25)
+    if frame % 400 == 0 and not app.is_playing:
+        app.play_animation()
+    if frame % K_SWEEP == 0:
+        app.toggle_rainbow()
+    if frame % 4999 == 0:
+        app.toggle_glow()
+    if frame % OVERLAY_EVERY == 0:
+        app.profiler.toggle_overlay()
+
+
+def exercise_wall(app, frame):
+    if frame % OVERLAY_EVERY == 0:
+        app.profiler.toggle_overlay()
+
+
+# name: (module, create, exercise, fps, warm-up frames, exercise cycle in frames)
+APPS = {
+    'heart1': (heart1, lambda: heart1.BeatingHeart(fps=20), exercise_heart1, 20, 2 * BPM_SWEEP, 2 * BPM_SWEEP),
+    'heart2': (heart2, lambda: heart2.HeartAnimation(fps=60), exercise_heart2, 60, 2 * K_SWEEP, 2 * K_SWEEP),
+    'wall': (heart_wall, lambda: heart_wall.HeartWall(200, 30, seed=1), exercise_wall, 30,
+             2 * OVERLAY_EVERY, 2 * OVERLAY_EVERY),
+}
+
+
+def pool_size(renderer):
+    """Canvas items held by the renderer's layers, shown or hidden"""
+    return sum(len(layer['items']) for layer in renderer.layers.values())
+
+
+def soak(name, frames, samples, warmup):
+    """Run one app; returns its samples as (frame, heap bytes, canvas items, pooled items)"""
+    module, create, exercise, fps = APPS[name][:4]
+    clock = fakes.SimulatedTime(1000.0)
+    module.time = clock
+    heart_scheduler.time = clock
+    samples_at = max(1, frames // samples)
+    tracemalloc.start()
+    try:
+        app = create()
+        pending = app.root.pending
+        taken = []
+        for frame in range(1, frames + 1):
+            clock.advance(1.0 / fps)
+            exercise(app, frame)
+            # One pass of the event loop: everything queued so far runs once
+            # (an animation callback reschedules itself for the next frame)
+            for _ in range(len(pending)):
+                app.root.run_next()
+            if frame % samples_at == 0:
+                gc.collect()
+                taken.append((frame, tracemalloc.get_traced_memory()[0],
+                              len(app.canvas.items), pool_size(app.renderer)))
+        pending.clear()
+    finally:
+        tracemalloc.stop()
+        module.time = time
+        heart_scheduler.time = time
+    return [sample for sample in taken if sample[0] > warmup]
+
+
+def growth(samples, column):
+    """How much the later half of the run exceeds the earlier half"""
+    half = len(samples) // 2
+    return (max(sample[column] for sample in samples[half:])
+            - max(sample[column] for sample in samples[:half]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that memory and Canvas items stay bounded over a long run")
+    parser.add_argument("--apps", nargs="+", choices=sorted(APPS), default=sorted(APPS), help="apps to soak")
+    parser.add_argument("--frames", type=int, help="simulated frames per app (default: the warm-up plus four exercise cycles)")
+    parser.add_argument("--samples", type=int, default=200, help="memory samples per app")
+    parser.add_argument("--warmup", type=int, help="frames in which caches may still fill (default: per app)")
+    parser.add_argument("--heap-slack", type=int, default=64, help="heap growth in KiB tolerated after the warm-up")
+    args = parser.parse_args()
+
+    # (frames, warm-up) per app
+    runs = {}
+    for name in args.apps:
+        warmup, cycle = APPS[name][4:]
+        warmup = warmup if args.warmup is None else args.warmup
+        frames = args.frames or warmup + 4 * cycle
+        if frames < warmup + 2 * cycle:
+            parser.error(f"{name} needs --frames of at least {warmup + 2 * cycle} "
+                         f"(the warm-up plus two {cycle}-frame exercise cycles)")
+        runs[name] = (frames, warmup)
+
+    print(f"{'app':<7} {'frames':>9} {'heap KiB':>9} {'growth':>8} {'items':>6} {'growth':>7} {'pooled':>7} {'growth':>7}")
+    failed = False
+    for name, (frames, warmup) in runs.items():
+        started = time.perf_counter()
+        samples = soak(name, frames, args.samples, warmup)
+        if len(samples) < 2:
+            sys.exit(f"too few samples after the {warmup}-frame warm-up; raise --frames or --samples")
+        heap = growth(samples, 1)
+        items = growth(samples, 2)
+        pooled = growth(samples, 3)
+        ok = heap <= args.heap_slack * 1024 and items <= 0 and pooled <= 0
+        failed |= not ok
+        print(f"{name:<7} {frames:>9} {samples[-1][1] / 1024:>9.0f} {heap / 1024:>8.1f} "
+              f"{samples[-1][2]:>6} {items:>7} {samples[-1][3]:>7} {pooled:>7}  "
+              f"{'ok' if ok else 'GROWING'} ({time.perf_counter() - started:.0f} s)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,60 @@
-import turtle
-import math
-t=turtle.Turtle()
-t.speed(0)
-t.color("red")
-turtle.bgcolor("black")
-def corazon(n):
-    x = 16* math.sin(n) ** 3
-    y = 13* math.cos(n) - 5 * \
-        math.cos(2*n) - 2*math.cos(3*n) - \
-        math.cos(4*n)
-    return x,y
-t.penup()
-for i in range(15):
-    t.goto(0, 0)
-    t.pendown()
-    for n in range(0, 100, 2):
-        x,y = corazon(n/10)
-        t.goto(x*i, y*i)
-    t.penup()
-t.hideturtle()
-turtle.done()
+import argparse
+import heart_scenes
+
+# Concentric hearts: heart i is the parametric heart at scale i * scale_step.
+# All hearts are computed in one batch and drawn as one Canvas line each,
+# followed by a single screen update, so hundreds of layers appear at once.
+# With --output the picture is rendered offscreen instead (no display needed).
+
+
+def picture_size(layers, scale_step, margin=20):
+    """Width and height that fit the largest heart"""
+    largest = max(0, layers - 1) * scale_step
+    # The heart spans x = -16 .. 16 and y = -17 .. 5 (times its scale)
+    return int(32 * largest) + 2 * margin, int(34 * largest) + 2 * margin
+
+
+def draw(renderer, hearts, color="#ff0000"):
+    """Draw every heart onto a renderer as one line each"""
+    renderer.add_layer("hearts", width=1)
+    renderer.draw_runs("hearts", [(coords, color) for coords in hearts])
+    renderer.update()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concentric hearts")
+    parser.add_argument("--layers", type=int, default=15, help="number of hearts")
+    parser.add_argument("--points", type=int, help="points per heart (default: adaptive, within --tolerance pixels)")
+    parser.add_argument("--scale-step", type=float, default=1.0, help="scale added from one heart to the next")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="max distance in pixels between the drawn line and the curve (adaptive sampling)")
+    parser.add_argument("--output", help="render offscreen to this .png/.ppm file instead of opening a window")
+    args = parser.parse_args()
+    if args.tolerance <= 0:
+        parser.error("--tolerance must be positive")
+
+    hearts = heart_scenes.nested_hearts(args.layers, args.points, args.scale_step, args.tolerance)
+    width, height = picture_size(args.layers, args.scale_step)
+    if args.output:
+        from heart_raster import FrameWriter, RasterRenderer
+        renderer = RasterRenderer(width, height, "#000000")
+        draw(renderer, hearts)
+        writer = FrameWriter(args.output)
+        writer.write(renderer)
+        writer.close()
+    else:
+        import tkinter as tk
+        from heart_render import CanvasRenderer
+        root = tk.Tk()
+        root.title("Hearts")
+        screen_width = root.winfo_screenwidth()
+        screen_height = root.winfo_screenheight() - 100
+        canvas = tk.Canvas(root, width=min(width, screen_width), height=min(height, screen_height),
+                           bg="black", highlightthickness=0)
+        canvas.pack(fill=tk.BOTH, expand=True)
+        renderer = CanvasRenderer(canvas)
+        # Shrink a picture that is larger than the screen (line widths stay)
+        fit = min(1.0, screen_width / width, screen_height / height)
+        if fit < 1.0:
+            hearts = heart_scenes.nested_hearts(args.layers, args.points, args.scale_step * fit, args.tolerance)
+        draw(renderer, hearts)
+        root.mainloop()
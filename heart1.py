@@ -1,10 +1,16 @@
-import turtle
-import math
+import heart_startup  # first, so startup is timed from here
 import tkinter as tk
 import time
+from heart_render import CanvasRenderer
+from heart_profiler import FrameProfiler
+from heart_quality import QualityGovernor
+from heart_scheduler import FrameClock, FrameScheduler
+
+heart_startup.mark("imports")
 
 class BeatingHeart:
-    def __init__(self):
+    def __init__(self, fps=20, adaptive=True, sampling="adaptive", tolerance=0.15,
+                 profile_log=None, wave_capacity=64, echoes=1, pipeline=False):
         self.root = tk.Tk()
         self.root.title("💗  Beating Heart Animation")
         self.root.configure(bg='#000000')
@@ -20,29 +26,45 @@ class BeatingHeart:
         self.canvas = tk.Canvas(self.root, width=850, height=440, bg='#000000', highlightthickness=3, highlightbackground="#FF0066")
         self.canvas.pack(pady=10)
         
-        # Setup turtle
-        self.screen = turtle.TurtleScreen(self.canvas)
-        self.screen.bgcolor("#000000")
-        self.screen.tracer(0)  # Turn off auto-update for smooth animation
-        
-        # Create multiple heart turtles for expanding pulse effect
-        self.hearts = []
-        for i in range(5):
-            heart = turtle.RawTurtle(self.screen)
-            heart.hideturtle()
-            heart.speed(0)
-            heart.width(3)
-            self.hearts.append({
-                'turtle': heart,
-                'scale': 1.0,
-                'opacity': 1.0,
-                'active': False
-            })
+        # Retained-mode renderer: one persistent Canvas item per heart
+        self.renderer = CanvasRenderer(self.canvas)
+        heart_startup.mark("window")
+        
+        # Paint a precomputed resting heart right away; it is replaced by the
+        # first real frame once NumPy, the scene and the controls are set up
+        self.splash = self.canvas.create_line(*heart_startup.resting_heart(), fill="#ff1466",
+                                              width=4, capstyle=tk.ROUND, joinstyle=tk.ROUND)
+        self.root.update()
+        heart_startup.mark("first frame")
+        
+        # The heart and its pulse waves; `echoes` waves are sent out per beat.
+        # With the pipeline the scene draws into frame buffers on a worker
+        # thread and the Tk thread only replays the newest one
+        from heart_scenes import BeatScene
+        self.pipeline = None
+        if pipeline:
+            from heart_pipeline import FramePipeline, FrameRecorder, replay
+            self.recorder = FrameRecorder()
+            self.scene = BeatScene(self.recorder, fps, sampling, tolerance, wave_capacity, echoes)
+            replay(self.recorder.take(), self.renderer)
+            self.pipeline = FramePipeline(self.produce_frame, 1.0 / fps)
+        else:
+            self.scene = BeatScene(self.renderer, fps, sampling, tolerance, wave_capacity, echoes)
         
         # Animation variables
         self.beat_time = 0
         self.is_beating = True
-        self.beat_interval = 0  # Counter for beat timing
+        self.fps = fps
+        self.clock = FrameClock(fps)
+        # Lowers drawing detail when frames take longer than 1 / fps
+        self.governor = QualityGovernor(fps, enabled=adaptive)
+        
+        # Per-frame timings: F3 toggles the overlay, profile_log streams JSON lines
+        self.profiler = FrameProfiler(self.canvas, profile_log)
+        self.root.bind("<F3>", self.profiler.toggle_overlay)
+        
+        # Renders the still heart once per state change while not beating
+        self.scheduler = FrameScheduler(self.root, self.render_still)
         
         # Control panel
         control_frame = tk.Frame(self.root, bg='#1a1a1a', relief=tk.RAISED, bd=3)
@@ -91,108 +113,89 @@ class BeatingHeart:
         info.pack(pady=10)
         
         # Start animation
+        if self.pipeline is not None:
+            self.frame_params = (self.bpm_var.get(), self.governor.quality, self.is_beating)
+            self.pipeline.start()
         self.animate()
     
-    def heart_parametric(self, t, scale=1.0):
-        """Parametric heart equation"""
-        x = 16 * math.sin(t)**3 * scale
-        y = (13*math.cos(t) - 5*math.cos(2*t) - 2*math.cos(3*t) - math.cos(4*t)) * scale
-        return x * 4, y * 4
-    
-    def draw_heart(self, heart_obj, scale, color, width):
-        """Draw a single heart at given scale"""
-        turtle_obj = heart_obj['turtle']
-        turtle_obj.clear()
-        turtle_obj.width(width)
-        turtle_obj.color(color)
-        turtle_obj.penup()
-        
-        # Draw heart
-        steps = 100
-        first = True
-        for i in range(steps + 1):
-            t = (i / steps) * 2 * math.pi
-            x, y = self.heart_parametric(t, scale)
-            
-            if first:
-                turtle_obj.goto(x, y)
-                turtle_obj.pendown()
-                first = False
-            else:
-                turtle_obj.goto(x, y)
-        
-        turtle_obj.penup()
-    
-    def get_pulse_color(self, opacity):
-        """Get color based on opacity"""
-        # Fade from bright pink to dark
-        r = int(255 * opacity)
-        g = int(20 * opacity)
-        b = int(102 * opacity)
-        return f"#{r:02x}{g:02x}{b:02x}"
-    
     def animate(self):
         """Main animation loop"""
+        self.draw_frame()
+        # Schedule next frame at the next deadline (late frames are dropped)
+        self.frame_id = self.root.after(self.clock.delay_ms(), self.animate)
+    
+    def draw_frame(self):
+        """Draw the frame that is due now"""
+        now = time.perf_counter()
+        dt, skipped = self.clock.tick(now)
+        if self.pipeline is not None:
+            self.show_frame(now, skipped)
+            return
         if not self.is_beating:
-            self.root.after(50, self.animate)
+            # No frames to measure: give detail back over time (the still
+            # heart does not depend on the level)
+            self.governor.idle()
             return
         
-        # Calculate beat timing based on BPM
+        prof = self.profiler if self.profiler.enabled else None
+        if prof:
+            prof.begin("animate")
+            tk_calls = self.renderer.tk_calls
+        
         bpm = self.bpm_var.get()
-        beat_duration = 60.0 / bpm  # seconds per beat
-        frames_per_beat = int(beat_duration * 20)  # 20 fps
-        
-        self.beat_interval += 1
-        
-        # REAL HEARTBEAT PATTERN: lub-DUB (two beats)
-        beat_phase = (self.beat_interval % frames_per_beat) / frames_per_beat
-        
-        # Main heart beating (lub-DUB pattern)
-        if beat_phase < 0.15:  # First beat (lub)
-            scale = 1.0 + (math.sin(beat_phase * math.pi / 0.15) * 0.3)
-        elif beat_phase < 0.25:  # Brief pause
-            scale = 1.0
-        elif beat_phase < 0.35:  # Second beat (DUB) - stronger
-            scale = 1.0 + (math.sin((beat_phase - 0.25) * math.pi / 0.1) * 0.4)
-        else:  # Relaxation
-            scale = 1.0
-        
-        # Draw main heart with pulsing
-        main_color = self.get_pulse_color(1.0)
-        self.draw_heart(self.hearts[0], scale, main_color, 4)
-        
-        # Expanding pulse waves (triggered at each beat)
-        if beat_phase < 0.02 or (0.25 < beat_phase < 0.27):  # Trigger new wave
-            # Find inactive heart for new wave
-            for heart in self.hearts[1:]:
-                if not heart['active']:
-                    heart['active'] = True
-                    heart['scale'] = scale
-                    heart['opacity'] = 1.0
-                    break
-        
-        # Update and draw expanding waves
-        for i, heart in enumerate(self.hearts[1:]):
-            if heart['active']:
-                # Expand
-                heart['scale'] += 0.04
-                heart['opacity'] -= 0.02
-                
-                # Deactivate if too faded
-                if heart['opacity'] <= 0:
-                    heart['active'] = False
-                    heart['turtle'].clear()
-                else:
-                    # Draw expanding heart
-                    color = self.get_pulse_color(heart['opacity'])
-                    width = max(1, int(4 * heart['opacity']))
-                    self.draw_heart(heart, heart['scale'], color, width)
+        waves = self.scene.step(dt, bpm, self.governor.quality, prof)
+        if self.splash is not None:
+            self.hide_splash()
         
         # Update screen
-        self.screen.update()
+        self.renderer.update()
+        self.governor.record(time.perf_counter() - now)
+        if prof:
+            prof.mark("update")
+            prof.end(tk_calls=self.renderer.tk_calls - tk_calls, waves=waves,
+                     late_ms=round(self.clock.lateness * 1000, 3), dropped=skipped,
+                     quality=self.governor.level)
+    
+    def produce_frame(self, target, dt):
+        """Compute the frame for time `target` (runs on the pipeline's worker thread)"""
+        bpm, quality, beating = self.frame_params
+        if beating:
+            self.scene.step(dt, bpm, quality)
+        else:
+            self.scene.draw_still()
+        return self.recorder.take()
+    
+    def show_frame(self, now, skipped):
+        """Pipeline mode: replay the newest frame the worker has ready"""
+        # Snapshot of the controls for the worker; Tk variables stay on this thread
+        self.frame_params = (self.bpm_var.get(), self.governor.quality, self.is_beating)
+        
+        prof = self.profiler if self.profiler.enabled else None
+        if prof:
+            prof.begin("show_frame")
+            tk_calls = self.renderer.tk_calls
         
-        # Schedule next frame (20 fps)
-        self.root.after(50, self.animate)
+        ops = self.pipeline.take(now)
+        if ops:
+            from heart_pipeline import replay
+            replay(ops, self.renderer)
+            if self.splash is not None:
+                self.hide_splash()
+        if prof:
+            prof.mark("draw")
+        self.renderer.update()
+        # The worker's time counts too, so a slow worker lowers the detail it computes
+        self.governor.record(max(time.perf_counter() - now, self.pipeline.compute_time))
+        if prof:
+            prof.mark("update")
+            prof.end(tk_calls=self.renderer.tk_calls - tk_calls,
+                     late_ms=round(self.clock.lateness * 1000, 3), dropped=skipped,
+                     discarded=self.pipeline.discarded, quality=self.governor.level)
+    
+    def hide_splash(self):
+        """Remove the startup heart once a real frame has been drawn"""
+        self.canvas.delete(self.splash)
+        self.splash = None
     
     def toggle_beat(self):
         """Toggle heartbeat"""
@@ -201,16 +204,100 @@ class BeatingHeart:
             self.beat_btn.config(text="💓 Stop Beating", bg="#FF0066")
         else:
             self.beat_btn.config(text="💔 Start Beating", bg="#666666")
-            # Clear all expanding waves
-            for heart in self.hearts[1:]:
-                heart['active'] = False
-                heart['turtle'].clear()
+            self.scheduler.invalidate("beat")
+    
+    def render_still(self, dirty):
+        """Show the resting heart without waves (called by the frame scheduler)"""
+        if self.is_beating or self.pipeline is not None:
+            return  # the pipeline's worker draws the resting heart itself
+        self.scene.draw_still()
+        self.renderer.update()
     
     def run(self):
         """Start the application"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            if self.pipeline is not None:
+                self.pipeline.stop()
+            self.profiler.close()
+    
+    async def run_async(self, live):
+        """Start the application on the running asyncio loop, fed by live BPM readings
+        
+        The loop owns the frame clock and pumps Tk events between frames, so
+        reading `live`'s socket or FIFO never blocks drawing and a new BPM is
+        applied on the very next frame.
+        """
+        import asyncio
+        self.root.after_cancel(self.frame_id)
+        try:
+            while True:
+                reading = live.take()
+                if reading is not None:
+                    self.bpm_var.set(reading[0])
+                self.draw_frame()
+                # Input events, idle callbacks and painting
+                self.root.update()
+                if reading is not None:
+                    live.displayed(reading[1])
+                await asyncio.sleep(self.clock.delay_ms() / 1000)
+        except tk.TclError:
+            pass  # the window was closed
+        finally:
+            if self.pipeline is not None:
+                self.pipeline.stop()
+            self.profiler.close()
 
 # Run the application
 if __name__ == "__main__":
-    app = BeatingHeart()
-    app.run()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Beating heart animation")
+    parser.add_argument("--fps", type=int, default=20, help="target frame rate, e.g. 30, 60 or 120")
+    parser.add_argument("--fixed-quality", action="store_true", help="never lower drawing detail to hold the frame rate")
+    parser.add_argument("--sampling", choices=["adaptive", "uniform"], default="adaptive", help="vertex placement along the curve")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="max distance in pixels between the drawn line and the curve (adaptive sampling)")
+    parser.add_argument("--profile-log", help="append per-frame timings to this JSON-lines file")
+    parser.add_argument("--wave-capacity", type=int, default=64, help="most pulse waves alive at once")
+    parser.add_argument("--echoes", type=int, default=1, help="pulse waves sent out per beat")
+    parser.add_argument("--pipeline", action="store_true", help="compute frames ahead on a worker thread")
+    parser.add_argument("--measure-startup", action="store_true", help="print the time to the first frame and quit")
+    parser.add_argument("--bpm-socket", help="take live BPM readings from this Unix socket (runs on asyncio)")
+    parser.add_argument("--bpm-fifo", help="take live BPM readings from this FIFO (runs on asyncio)")
+    args = parser.parse_args()
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    if args.tolerance <= 0:
+        parser.error("--tolerance must be positive")
+    if args.wave_capacity < 1:
+        parser.error("--wave-capacity must be at least 1")
+    app = BeatingHeart(fps=args.fps, adaptive=not args.fixed_quality,
+                       sampling=args.sampling, tolerance=args.tolerance,
+                       profile_log=args.profile_log, wave_capacity=args.wave_capacity,
+                       echoes=args.echoes, pipeline=args.pipeline)
+    if args.measure_startup:
+        app.root.update()
+        heart_startup.mark("ready")
+        heart_startup.report()
+        if app.pipeline is not None:
+            app.pipeline.stop()
+        app.root.destroy()
+    elif args.bpm_socket or args.bpm_fifo:
+        import asyncio
+        from heart_live import LiveBpm
+        live = LiveBpm()
+        
+        async def main():
+            await live.listen(args.bpm_socket, args.bpm_fifo)
+            try:
+                await app.run_async(live)
+            finally:
+                await live.close()
+        
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            pass
+        print(f"live BPM: {live.summary()}")
+    else:
+        app.run()
\ No newline at end of file
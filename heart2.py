@@ -1,12 +1,20 @@
-import turtle
-import math
+import heart_startup  # first, so startup is timed from here
 import tkinter as tk
-from tkinter import ttk
-import random
+import time
+from heart_profiler import FrameProfiler
+from heart_quality import QualityGovernor
+from heart_render import CanvasRenderer
+from heart_scheduler import FrameScheduler
+
+heart_startup.mark("imports")
+
+# Longest line (in points) that playback extends before starting a new one
+PLAY_RUN_POINTS = 64
 
 # Heart equation: y = |x|^(2/3) + 0.9*sin(kx)*sqrt(3-x^2)
 class HeartAnimation:
-    def __init__(self):
+    def __init__(self, fps=60, adaptive=True, sampling="adaptive", tolerance=0.25,
+                 profile_log=None, rainbow_bands=36):
         self.root = tk.Tk()
         self.root.title("❤️ Interactive Heart Equation Visualizer")
         self.root.configure(bg='#0a0a0a')
@@ -22,32 +30,43 @@ class HeartAnimation:
                         fg="#FF1493", bg="#0a0a0a")
         title.pack()
         
-        # Create canvas for turtle
+        # Create canvas for the heart
         self.canvas = tk.Canvas(self.root, width=860, height=550, bg='#0a0a0a', highlightthickness=2, highlightbackground="#FF1493")
         self.canvas.pack(pady=10)
         
-        # Setup turtle
-        self.screen = turtle.TurtleScreen(self.canvas)
-        self.screen.bgcolor("#0a0a0a")
-        self.pen = turtle.RawTurtle(self.screen)
-        self.pen.hideturtle()
-        self.pen.speed(0)
-        self.pen.width(3)
-        
-        # Multiple pens for glow effect
-        self.glow_pens = []
-        for i in range(3):
-            glow_pen = turtle.RawTurtle(self.screen)
-            glow_pen.hideturtle()
-            glow_pen.speed(0)
-            glow_pen.width(8 - i*2)
-            self.glow_pens.append(glow_pen)
-        
-        # Color variables
-        self.colors = ["#FF1493", "#FF69B4", "#FF0066", "#FF33CC", "#CC0099", "#FF1493"]
-        self.current_color_index = 0
-        self.rainbow_mode = False
-        self.glow_enabled = True
+        # Retained-mode renderer: persistent Canvas items per layer
+        self.renderer = CanvasRenderer(self.canvas)
+        heart_startup.mark("window")
+        
+        # Paint a precomputed low-resolution curve right away; the full one
+        # replaces it once NumPy, the scene and the controls are set up
+        self.k_value = 20.75
+        splash = self.canvas.create_line(*heart_startup.equation_heart(self.k_value), fill="#FF1493",
+                                         width=3, capstyle=tk.ROUND, joinstyle=tk.ROUND)
+        self.root.update()
+        heart_startup.mark("first frame")
+        
+        # The curve with its glow and rainbow modes
+        from heart_scenes import CurveScene
+        self.scene = CurveScene(self.renderer, rainbow_bands)
+        
+        # Per-frame timings: F3 toggles the overlay, profile_log streams JSON lines
+        self.profiler = FrameProfiler(self.canvas, profile_log)
+        self.root.bind("<F3>", self.profiler.toggle_overlay)
+        
+        # Vertex placement: "adaptive" (within tolerance pixels) or "uniform"
+        self.sampling = sampling
+        self.tolerance = tolerance
+        
+        # Curves for the k values next to the slider are computed while idle
+        self.prefetch_id = None
+        
+        # Slider and button handlers only mark state dirty; one render per frame
+        self.fps = fps
+        self.scheduler = FrameScheduler(self.root, self.render, min_interval_ms=1000 // fps)
+        # Lowers glow passes and curve detail when frames take longer than 1 / fps
+        self.governor = QualityGovernor(fps, enabled=adaptive)
+        self.idle_check_id = None
         
         # Equation label with better styling
         eq_frame = tk.Frame(self.root, bg='#1a1a1a', relief=tk.RIDGE, bd=2)
@@ -60,7 +79,6 @@ class HeartAnimation:
         eq_label.pack(pady=8)
         
         # K value display
-        self.k_value = 20.75
         k_frame = tk.Frame(self.root, bg='#0a0a0a')
         k_frame.pack(pady=5)
         
@@ -185,108 +203,82 @@ class HeartAnimation:
         
         self.is_playing = False
         self.current_step = 0
+        self.play_k = None
+        self.play_runs = {}  # layer -> (color, points) of its newest run during playback
         
         # Draw initial heart
         self.draw_heart(self.k_value)
-        
-    def heart_equation(self, x, k):
-        """Calculate y value for heart equation"""
-        try:
-            if 3 - x**2 < 0:
-                return None
-            y = abs(x)**(2/3) + 0.9 * math.sin(k * x) * math.sqrt(3 - x**2)
-            return y
-        except:
-            return None
+        self.canvas.delete(splash)
+        
+    def curve_sampling(self):
+        """How the curve is sampled now: ("uniform", steps) or ("adaptive", tolerance)"""
+        quality = self.governor.quality
+        if self.sampling == "adaptive":
+            return ("adaptive", self.tolerance * quality['tolerance'])
+        return ("uniform", quality['curve_steps'])
     
-    def get_rainbow_color(self, step, max_steps):
-        """Generate rainbow colors"""
-        hue = (step / max_steps) * 360
-        # Convert HSV to RGB (simplified)
-        c = 1
-        x = c * (1 - abs((hue / 60) % 2 - 1))
-        m = 0
-        
-        if hue < 60:
-            r, g, b = c, x, 0
-        elif hue < 120:
-            r, g, b = x, c, 0
-        elif hue < 180:
-            r, g, b = 0, c, x
-        elif hue < 240:
-            r, g, b = 0, x, c
-        elif hue < 300:
-            r, g, b = x, 0, c
-        else:
-            r, g, b = c, 0, x
-        
-        return f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
+    def prefetch(self, sampling=None):
+        """While idle, compute the curves for k values next to the slider"""
+        import heart_curves
+        self.prefetch_id = None
+        if sampling is None:
+            sampling = self.curve_sampling()
+        cache = self.scene.geometry_cache
+        resolution = float(self.slider.cget("resolution"))
+        ks = []
+        for offset in (1, -1, 2, -2):
+            k = self.k_value + offset * resolution
+            if 1 <= k <= 50 and (k, sampling, "coords") not in cache:
+                ks.append(k)
+        if not ks:
+            return
+        method, value = sampling
+        if method == "adaptive":
+            # Each k has its own x grid
+            for k in ks:
+                cache.put((k, sampling, "coords"), self.scene.compute_curve(k, sampling))
+            return
+        # One batch evaluation for all neighbours
+        grid = heart_curves.equation_grid(value)
+        for k, ys in zip(ks, grid.evaluate_ks(ks)):
+            cache.put((k, sampling, "coords"), heart_curves.canvas_coords(grid.defined_xs, ys, 100))
+    
+    def glow_visible(self):
+        """Whether the glow is drawn at the current quality level"""
+        return self.scene.glow_enabled and self.governor.quality['glow_layers'] > 0
     
-    def draw_heart(self, k, steps=300):
+    def draw_heart(self, k, steps=None, prof=None):
         """Draw the heart with given k value"""
-        self.pen.clear()
-        for glow_pen in self.glow_pens:
-            glow_pen.clear()
-        
-        self.pen.penup()
-        
-        # Collect points
-        x_values = []
-        y_values = []
-        
-        for i in range(steps + 1):
-            x = -1.8 + (3.6 * i / steps)
-            y = self.heart_equation(x, k)
-            if y is not None:
-                x_values.append(x * 100)
-                y_values.append(y * 100)
-        
-        if not x_values:
-            return
-        
-        # Draw glow effect
-        if self.glow_enabled:
-            for idx, glow_pen in enumerate(self.glow_pens):
-                glow_pen.penup()
-                glow_pen.goto(x_values[0], y_values[0])
-                glow_pen.pendown()
-                
-                # Set glow color (lighter than main)
-                if self.rainbow_mode:
-                    glow_pen.color("#FF1493")
-                else:
-                    alpha = 0.3 + idx * 0.2
-                    glow_pen.color(self.colors[self.current_color_index])
-                
-                for i in range(1, len(x_values)):
-                    glow_pen.goto(x_values[i], y_values[i])
-                glow_pen.penup()
-        
-        # Draw main heart
-        self.pen.goto(x_values[0], y_values[0])
-        self.pen.pendown()
-        
-        if self.rainbow_mode:
-            for i in range(1, len(x_values)):
-                color = self.get_rainbow_color(i, len(x_values))
-                self.pen.color(color)
-                self.pen.goto(x_values[i], y_values[i])
-        else:
-            self.pen.color(self.colors[self.current_color_index])
-            for i in range(1, len(x_values)):
-                self.pen.goto(x_values[i], y_values[i])
-        
-        self.pen.penup()
+        sampling = self.curve_sampling() if steps is None else ("uniform", steps)
+        scene = self.scene
+        runs = scene.curve_rainbow_runs(k, sampling) if scene.rainbow_mode else None
+        coords = scene.curve_coords(k, sampling)
+        if prof:
+            prof.mark("geometry")
+        scene.draw_curve(coords, runs=runs, glow=self.glow_visible())
+        if prof:
+            prof.mark("draw")
     
     def play_animation(self):
         """Animate the heart drawing"""
         self.is_playing = True
+        self.play_k = None
         self.play_btn.config(text="⏸ Playing...", state=tk.DISABLED)
         self.animate_step(0)
     
+    def prepare_playback(self, k, max_steps):
+        """Evaluate the whole curve once for incremental playback"""
+        import heart_curves
+        grid = heart_curves.equation_grid(max_steps)
+        self.play_coords = self.scene.curve_coords(k, ("uniform", max_steps))
+        # play_counts[i]: number of drawable points among grid points 0..i
+        self.play_counts = grid.counts
+        self.play_k = k
+    
     def animate_step(self, step):
         """Draw one step of the animation"""
         max_steps = 300
+        started = time.perf_counter()
         
         if not self.is_playing or step > max_steps:
             self.is_playing = False
@@ -294,94 +286,166 @@ class HeartAnimation:
             self.draw_heart(self.k_value)
             return
         
-        self.pen.clear()
-        for glow_pen in self.glow_pens:
-            glow_pen.clear()
-        
-        self.pen.penup()
-        
-        k = self.k_value
-        
-        # Collect points for this step
-        points = []
-        for i in range(step + 1):
-            x = -1.8 + (3.6 * i / max_steps)
-            y = self.heart_equation(x, k)
-            if y is not None:
-                points.append((x * 100, y * 100))
-        
-        if not points:
-            self.root.after(10, lambda: self.animate_step(step + 1))
-            return
-        
-        # Draw glow
-        if self.glow_enabled:
-            for glow_pen in self.glow_pens:
-                glow_pen.penup()
-                glow_pen.goto(points[0][0], points[0][1])
-                glow_pen.pendown()
-                glow_pen.color("#FF1493")
-                for point in points[1:]:
-                    glow_pen.goto(point[0], point[1])
-                glow_pen.penup()
-        
-        # Draw main line
-        self.pen.goto(points[0][0], points[0][1])
-        self.pen.pendown()
-        
-        for i, point in enumerate(points[1:]):
-            if self.rainbow_mode:
-                color = self.get_rainbow_color(i, len(points))
-                self.pen.color(color)
-            else:
-                self.pen.color(self.colors[self.current_color_index])
-            self.pen.goto(point[0], point[1])
-        
-        self.pen.penup()
+        prof = self.profiler if self.profiler.enabled else None
+        if prof:
+            prof.begin("animate_step")
+            tk_calls = self.renderer.tk_calls
+        
+        if self.play_k != self.k_value:
+            # First step, k changed or a mode was toggled: redraw the prefix once
+            self.prepare_playback(self.k_value, max_steps)
+            coords = self.play_coords
+            if prof:
+                prof.mark("geometry")
+            self.scene.draw_curve(coords[:2 * self.play_counts[step]], len(coords) // 2,
+                                  glow=self.glow_visible())
+            self.play_runs = {}
+        else:
+            # Only the newest segment is added to each layer
+            coords = self.play_coords
+            count = self.play_counts[step]
+            if count >= 2 and count > self.play_counts[step - 1]:
+                segment = coords[2*count - 4:2*count]
+                if prof:
+                    prof.mark("geometry")
+                scene = self.scene
+                if self.glow_visible():
+                    self.play_segment("glow", segment, scene.glow_color())
+                if scene.rainbow_mode:
+                    color = scene.rainbow_lut(len(coords) // 2)[count - 1]
+                else:
+                    color = scene.line_color()
+                self.play_segment("main", segment, color)
+        
+        # Time the repaint too: that is where most of a frame's cost is
+        self.renderer.update()
+        if self.governor.record(time.perf_counter() - started):
+            self.play_k = None  # quality changed: redraw the prefix with it
+        if prof:
+            prof.mark("draw")
+            cache = self.scene.geometry_cache
+            prof.end(tk_calls=self.renderer.tk_calls - tk_calls, step=step,
+                     quality=self.governor.level, cache_hits=cache.hits, cache_misses=cache.misses)
         
         # Schedule next step with variable speed
         delay = max(1, 25 - self.speed_var.get())
-        self.root.after(delay, lambda: self.animate_step(step + 1))
+        self.root.after(delay, self.animate_step, step + 1)
+    
+    def play_segment(self, layer, segment, color):
+        """Add one playback segment to a layer
+        
+        The segment lengthens the layer's newest line while that has the same
+        color (one hue band in rainbow mode) and fewer than PLAY_RUN_POINTS
+        points, so a playback leaves a few Canvas items per layer rather than
+        one per segment, and each push stays short.
+        """
+        run = self.play_runs.get(layer)
+        if run is not None and run[0] == color and run[1] < PLAY_RUN_POINTS:
+            self.renderer.extend(layer, segment)
+            self.play_runs[layer] = (color, run[1] + 1)
+        else:
+            self.renderer.append(layer, segment, color)
+            self.play_runs[layer] = (color, 2)
     
     def reset(self):
         """Reset the animation"""
         self.is_playing = False
-        self.pen.clear()
-        for glow_pen in self.glow_pens:
-            glow_pen.clear()
+        self.renderer.clear_all()
         self.play_btn.config(text="▶ Play", state=tk.NORMAL)
         self.draw_heart(self.k_value)
     
     def toggle_rainbow(self):
         """Toggle rainbow mode"""
-        self.rainbow_mode = not self.rainbow_mode
-        if self.rainbow_mode:
+        self.scene.rainbow_mode = not self.scene.rainbow_mode
+        if self.scene.rainbow_mode:
             self.rainbow_btn.config(text="🌈 Rainbow ON", bg="#00FF00")
         else:
             self.rainbow_btn.config(text="🌈 Rainbow OFF", bg="#9933FF")
-        self.draw_heart(self.k_value)
+        self.redraw()
     
     def toggle_glow(self):
         """Toggle glow effect"""
-        self.glow_enabled = not self.glow_enabled
-        if self.glow_enabled:
+        self.scene.glow_enabled = not self.scene.glow_enabled
+        if self.scene.glow_enabled:
             self.glow_btn.config(text="✨ Glow ON", bg="#00CCFF")
         else:
             self.glow_btn.config(text="✨ Glow OFF", bg="#666666")
-        self.draw_heart(self.k_value)
+        self.redraw()
+    
+    def render(self, dirty):
+        """Draw the newest state once (called by the frame scheduler)"""
+        if self.is_playing:
+            return  # animate_step picks up the new state on its next tick
+        prof = self.profiler if self.profiler.enabled else None
+        if prof:
+            prof.begin("render")
+            tk_calls = self.renderer.tk_calls
+        started = time.perf_counter()
+        self.draw_heart(self.k_value, prof=prof)
+        self.renderer.update()
+        self.governor.record(time.perf_counter() - started)
+        if prof:
+            prof.mark("update")
+            cache = self.scene.geometry_cache
+            prof.end(tk_calls=self.renderer.tk_calls - tk_calls, k=self.k_value,
+                     quality=self.governor.level, cache_hits=cache.hits, cache_misses=cache.misses)
+        if "k" in dirty and self.prefetch_id is None:
+            self.prefetch_id = self.root.after_idle(self.prefetch)
+        if self.governor.level > 0 and self.idle_check_id is None:
+            self.idle_check_id = self.root.after(1000, self.restore_quality)
+    
+    def restore_quality(self):
+        """While lowered, give detail back when no frames are being drawn"""
+        self.idle_check_id = None
+        if self.governor.idle():
+            self.redraw()  # measured again by the render it triggers
+        elif self.governor.level > 0:
+            self.idle_check_id = self.root.after(1000, self.restore_quality)
+    
+    def redraw(self):
+        """Redraw after a mode change (mid-playback, redraw the drawn prefix)"""
+        if self.is_playing:
+            self.play_k = None
+        self.scheduler.invalidate("mode")
     
     def update_k(self, value):
         """Update k value from slider"""
         self.k_value = float(value)
         self.k_label.config(text=f"k = {self.k_value:.2f}")
-        if not self.is_playing:
-            self.draw_heart(self.k_value)
+        self.scheduler.invalidate("k")
     
     def run(self):
         """Start the application"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.profiler.close()
 
 # Run the application
 if __name__ == "__main__":
-    app = HeartAnimation()
-    app.run()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Interactive heart equation visualizer")
+    parser.add_argument("--fps", type=int, default=60, help="target frame rate, e.g. 30, 60 or 120")
+    parser.add_argument("--fixed-quality", action="store_true", help="never lower drawing detail to hold the frame rate")
+    parser.add_argument("--sampling", choices=["adaptive", "uniform"], default="adaptive", help="vertex placement along the curve")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="max distance in pixels between the drawn line and the curve (adaptive sampling)")
+    parser.add_argument("--profile-log", help="append per-frame timings to this JSON-lines file")
+    parser.add_argument("--rainbow-bands", type=int, default=36, help="hue bands in rainbow mode (0: one hue per segment)")
+    parser.add_argument("--measure-startup", action="store_true", help="print the time to the first frame and quit")
+    args = parser.parse_args()
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    if args.tolerance <= 0:
+        parser.error("--tolerance must be positive")
+    if args.rainbow_bands < 0:
+        parser.error("--rainbow-bands must not be negative")
+    app = HeartAnimation(fps=args.fps, adaptive=not args.fixed_quality,
+                         sampling=args.sampling, tolerance=args.tolerance,
+                         profile_log=args.profile_log, rainbow_bands=args.rainbow_bands)
+    if args.measure_startup:
+        app.root.update()
+        heart_startup.mark("ready")
+        heart_startup.report()
+        app.root.destroy()
+    else:
+        app.run()
\ No newline at end of file
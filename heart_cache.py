@@ -0,0 +1,71 @@
+import sys
+from collections import OrderedDict
+
+
+def size_of(value):
+    """Rough memory footprint of a cached value in bytes"""
+    nbytes = getattr(value, "nbytes", None)  # NumPy arrays
+    if nbytes is not None:
+        return nbytes + 112
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(size_of(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class GeometryCache:
+    """Bounded, memory-capped LRU cache for computed vertex and color arrays
+
+    Keys are tuples such as (k, steps, mode). When the estimated size of the
+    cached values exceeds max_bytes the least recently used entries are
+    dropped.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a value, evicting least recently used entries to stay in budget"""
+        if key in self.entries:
+            self.discard(key)
+        size = size_of(value)
+        if size > self.max_bytes:
+            return
+        while self.entries and self.bytes + size > self.max_bytes:
+            self.discard(next(iter(self.entries)))
+        self.entries[key] = value
+        self.sizes[key] = size
+        self.bytes += size
+
+    def discard(self, key):
+        """Remove an entry if present"""
+        if key in self.entries:
+            del self.entries[key]
+            self.bytes -= self.sizes.pop(key)
+
+    def clear(self):
+        """Drop every entry (hit/miss counters are kept)"""
+        self.entries.clear()
+        self.sizes.clear()
+        self.bytes = 0
@@ -0,0 +1,282 @@
+import math
+from functools import lru_cache
+
+# NumPy is optional: every function below also works on plain lists
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TWO_PI = 2 * math.pi
+NAN = float("nan")
+
+# x range plotted by heart2.py
+X_MIN = -1.8
+X_MAX = 1.8
+
+
+def corazon_point(t):
+    """Classic heart curve (heart.py's corazon) for a single parameter"""
+    x = 16 * math.sin(t) ** 3
+    y = 13 * math.cos(t) - 5 * math.cos(2 * t) - 2 * math.cos(3 * t) - math.cos(4 * t)
+    return x, y
+
+
+def heart_equation_point(x, k):
+    """y = |x|^(2/3) + 0.9*sin(kx)*sqrt(3-x^2), NaN outside the domain"""
+    r = 3 - x * x
+    if r < 0:
+        return NAN
+    return abs(x) ** (2 / 3) + 0.9 * math.sin(k * x) * math.sqrt(r)
+
+
+def _frozen(values):
+    """Make a cached grid read-only so callers can't corrupt it"""
+    if np is not None:
+        values.setflags(write=False)
+        return values
+    return tuple(values)
+
+
+@lru_cache(maxsize=64)
+def linspace(start, stop, steps):
+    """steps + 1 evenly spaced values from start to stop (inclusive)"""
+    if np is not None:
+        return _frozen(np.linspace(start, stop, steps + 1))
+    span = stop - start
+    return _frozen([start + span * i / steps for i in range(steps + 1)])
+
+
+def param_grid(steps):
+    """Parameter grid 0..2π used by the parametric heart"""
+    return linspace(0.0, TWO_PI, steps)
+
+
+def x_grid(steps, x_min=X_MIN, x_max=X_MAX):
+    """x grid used by the heart equation"""
+    return linspace(x_min, x_max, steps)
+
+
+def corazon(ts):
+    """Batch corazon: parameters in, (xs, ys) out"""
+    if np is not None:
+        ts = np.asarray(ts, dtype=float)
+        xs = 16 * np.sin(ts) ** 3
+        ys = 13 * np.cos(ts) - 5 * np.cos(2 * ts) - 2 * np.cos(3 * ts) - np.cos(4 * ts)
+        return xs, ys
+    xs = []
+    ys = []
+    for t in ts:
+        x, y = corazon_point(t)
+        xs.append(x)
+        ys.append(y)
+    return xs, ys
+
+
+def heart_parametric_scales(ts, scales):
+    """Evaluate the parametric heart for many scales against one grid
+
+    Returns (xs_rows, ys_rows) with one row per scale.
+    """
+    xs, ys = corazon(ts)
+    if np is not None:
+        factors = 4 * np.asarray(scales, dtype=float)
+        return np.outer(factors, xs), np.outer(factors, ys)
+    rows_x = []
+    rows_y = []
+    for scale in scales:
+        factor = 4 * scale
+        rows_x.append([x * factor for x in xs])
+        rows_y.append([y * factor for y in ys])
+    return rows_x, rows_y
+
+
+def heart_equation(xs, k):
+    """Batch heart equation: y for every x (NaN outside the domain)"""
+    if np is not None:
+        xs = np.asarray(xs, dtype=float)
+        r = 3 - xs * xs
+        with np.errstate(invalid="ignore"):
+            ys = np.abs(xs) ** (2 / 3) + 0.9 * np.sin(k * xs) * np.sqrt(r)
+        ys[r < 0] = np.nan
+        return ys
+    return [heart_equation_point(x, k) for x in xs]
+
+
+def canvas_coords(xs, ys, scale=1.0):
+    """Flat Canvas coordinate list [x0, y0, x1, y1, ...], dropping NaN points
+
+    The y axis is flipped so that, with the origin in the middle of the
+    canvas, the result matches turtle's coordinate system.
+    """
+    if np is not None:
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        keep = ~(np.isnan(xs) | np.isnan(ys))
+        flat = np.empty(2 * int(keep.sum()))
+        flat[0::2] = xs[keep] * scale
+        flat[1::2] = ys[keep] * -scale
+        return flat.tolist()
+    coords = []
+    for x, y in zip(xs, ys):
+        if x == x and y == y:
+            coords.append(x * scale)
+            coords.append(y * -scale)
+    return coords
+
+
+class HeartEquationGrid:
+    """The heart equation on a fixed x grid, split into k-independent factors
+
+    y = base(x) + amp(x) * sin(k*x) with base = |x|^(2/3) and
+    amp = 0.9*sqrt(3-x^2). The domain mask, base and amp are computed once,
+    so a new k only costs one sin pass and one multiply-add.
+    """
+
+    def __init__(self, xs):
+        self.xs = xs
+        # counts[i]: number of points inside the domain among xs[0..i]
+        self.counts = []
+        count = 0
+        for x in xs:
+            if 3 - x * x >= 0:
+                count += 1
+            self.counts.append(count)
+        if np is not None:
+            xs = np.asarray(xs, dtype=float)
+            self.mask = 3 - xs * xs >= 0
+            self.defined_xs = xs[self.mask]
+            self.base = np.abs(self.defined_xs) ** (2 / 3)
+            self.amp = 0.9 * np.sqrt(3 - self.defined_xs ** 2)
+        else:
+            self.mask = [3 - x * x >= 0 for x in xs]
+            self.defined_xs = [x for x, inside in zip(xs, self.mask) if inside]
+            self.base = [abs(x) ** (2 / 3) for x in self.defined_xs]
+            self.amp = [0.9 * math.sqrt(3 - x * x) for x in self.defined_xs]
+
+    def evaluate(self, k):
+        """y values for the points inside the domain"""
+        if np is not None:
+            return self.base + self.amp * np.sin(k * self.defined_xs)
+        sin = math.sin
+        return [b + a * sin(k * x) for x, b, a in zip(self.defined_xs, self.base, self.amp)]
+
+    def evaluate_ks(self, ks):
+        """One row of in-domain y values per k"""
+        if np is not None:
+            return self.base + self.amp * np.sin(np.outer(np.asarray(ks, dtype=float), self.defined_xs))
+        return [self.evaluate(k) for k in ks]
+
+    def coords(self, k, scale=1.0):
+        """Flat Canvas coordinates for k (same as canvas_coords on the full grid)"""
+        return canvas_coords(self.defined_xs, self.evaluate(k), scale)
+
+
+@lru_cache(maxsize=16)
+def equation_grid(steps, x_min=X_MIN, x_max=X_MAX):
+    """Shared HeartEquationGrid for a uniform x grid"""
+    return HeartEquationGrid(x_grid(steps, x_min, x_max))
+
+
+def _deviation(a, b, p):
+    """Distance from point p to the segment a-b"""
+    dx = b[0] - a[0]
+    dy = b[1] - a[1]
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    u = ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length_sq
+    u = min(1.0, max(0.0, u))
+    return math.hypot(p[0] - a[0] - u * dx, p[1] - a[1] - u * dy)
+
+
+# Fraction of the tolerance the sampled chord deviation may reach; keeps
+# the true deviation (between the samples) within the tolerance
+CHORD_MARGIN = 0.8
+
+
+def _subdivide(func, a, pa, b, pb, pm, tolerance, depth, out):
+    # The midpoint alone misses bends that cross the chord there (an
+    # S-shaped piece), so the quarter points are checked as well; they are
+    # the midpoints of the halves, so a split reuses them. Three points
+    # still underestimate the worst deviation a little, hence the margin.
+    m = (a + b) / 2
+    p1 = func((a + m) / 2)
+    p3 = func((m + b) / 2)
+    if depth > 0 and max(_deviation(pa, pb, p1), _deviation(pa, pb, pm),
+                         _deviation(pa, pb, p3)) > tolerance * CHORD_MARGIN:
+        _subdivide(func, a, pa, m, pm, p1, tolerance, depth - 1, out)
+        _subdivide(func, m, pm, b, pb, p3, tolerance, depth - 1, out)
+    else:
+        out.append(b)
+
+
+def adaptive_samples(func, start, stop, tolerance, segments=16, max_depth=10):
+    """Parameters where a polyline through func(t) stays within tolerance
+
+    func maps a parameter to an (x, y) point in pixels. The range is first
+    cut into `segments` equal pieces, then each piece is halved while the
+    curve's midpoint lies further than `tolerance` pixels from the chord.
+    Flat or small stretches get few vertices, tight bends get many.
+    """
+    ts = [start]
+    step = (stop - start) / segments
+    a = start
+    pa = func(a)
+    for i in range(1, segments + 1):
+        b = start + i * step
+        pb = func(b)
+        _subdivide(func, a, pa, b, pb, func((a + b) / 2), tolerance, max_depth, ts)
+        a, pa = b, pb
+    return _frozen(np.array(ts) if np is not None else ts)
+
+
+def _tolerance_bucket(tolerance):
+    """Round a tolerance down to a half-octave so similar sizes share a grid"""
+    return 2 ** (math.floor(math.log2(tolerance) * 2) / 2)
+
+
+@lru_cache(maxsize=128)
+def _corazon_samples(start, stop, unit_tolerance):
+    return adaptive_samples(corazon_point, start, stop, unit_tolerance)
+
+
+def corazon_samples(scale, tolerance=0.5, start=0.0, stop=TWO_PI):
+    """Adaptive parameter grid for corazon drawn `scale` pixels per unit
+
+    Scaling the curve scales the chord error, so the grid for a size is the
+    unit-curve grid at tolerance / scale; sizes within half an octave share
+    one cached grid.
+    """
+    if scale <= 0:
+        return _frozen(np.array([start, stop]) if np is not None else [start, stop])
+    return _corazon_samples(start, stop, _tolerance_bucket(tolerance / scale))
+
+
+@lru_cache(maxsize=256)
+def equation_samples(k, tolerance=0.5, scale=100):
+    """Adaptive x grid for the heart equation drawn `scale` pixels per unit
+
+    Only the domain |x| <= sqrt(3) is sampled. The initial split puts at
+    least four pieces in every period of sin(kx), so no oscillation is
+    skipped over at high k.
+    """
+    edge = math.sqrt(3)
+
+    # The curve is vertical at the domain edges (sqrt(3 - x^2)) and has a
+    # cusp at x = 0 (|x|^(2/3)); a chord test on x misses the error bunched
+    # up against those points. Sampling x = sqrt(3) * sin(a)^3 instead makes
+    # both factors smooth in a: |x|^(2/3) = 3^(1/3) * sin(a)^2 and
+    # sqrt(3 - x^2) = sqrt(3) * cos(a) * sqrt(1 + sin(a)^2 + sin(a)^4).
+    def point(a):
+        s = math.sin(a)
+        x = edge * s ** 3
+        r = edge * math.cos(a) * math.sqrt(1 + s * s + s ** 4)
+        return x * scale, (abs(x) ** (2 / 3) + 0.9 * math.sin(k * x) * r) * scale
+
+    # dx/da is at most 2, so this puts at least four pieces in every period
+    segments = max(16, int(math.ceil(4 * abs(k))))
+    angles = adaptive_samples(point, -math.pi / 2, math.pi / 2, tolerance, segments)
+    if np is not None:
+        return _frozen(edge * np.sin(angles) ** 3)
+    return _frozen([edge * math.sin(a) ** 3 for a in angles])
@@ -0,0 +1,205 @@
+import array
+import json
+import math
+import os
+import time
+from multiprocessing import Pool, shared_memory
+import heart_curves
+from heart_raster import FrameWriter, RasterRenderer, SCENE_SIZES, encode_png, encode_ppm
+from heart_scenes import BeatScene, CurveScene
+
+# Batch export of animation assets, rendered offscreen on a process pool:
+#
+#   sweep - the heart2 curve for every slider position, k = 1 .. 50 in steps
+#           of 0.25 (197 frames)
+#   beats - one seamless beat cycle of heart1 for every BPM from 40 to 150
+#
+# Workers only render and encode; the parent writes the frames in order and
+# records its progress, so an interrupted export resumes where it stopped.
+
+PROGRESS_FILE = "progress.json"
+
+# Worker state, set up once per process by _init_worker
+_worker = {}
+
+
+def sweep_ks(k_min=1.0, k_max=50.0, resolution=0.25):
+    """The k values of the heart2 slider"""
+    count = int(round((k_max - k_min) / resolution)) + 1
+    return [k_min + i * resolution for i in range(count)]
+
+
+def encode(fmt, width, height, rgb):
+    if fmt == "png":
+        return encode_png(width, height, rgb)
+    return encode_ppm(width, height, rgb)
+
+
+def share_curves(ks, steps):
+    """Evaluate the sweep once, in the parent, into a shared memory block
+
+    Every k on the uniform x grid keeps the same in-domain points, so the
+    curves form a len(ks) x row_length block of floats that the workers
+    read in place instead of receiving pickled copies.
+    """
+    grid = heart_curves.equation_grid(steps)
+    rows = [heart_curves.canvas_coords(grid.defined_xs, ys, 100) for ys in grid.evaluate_ks(ks)]
+    row_length = len(rows[0])
+    block = shared_memory.SharedMemory(create=True, size=8 * len(rows) * row_length)
+    values = block.buf.cast("d")
+    for i, row in enumerate(rows):
+        values[i * row_length:(i + 1) * row_length] = array.array("d", row)
+    values.release()
+    return block, row_length
+
+
+def _init_worker(job, options, block_name=None, row_length=None):
+    """Build the worker's renderer and scene once; attach to the shared curves"""
+    width, height, background = SCENE_SIZES['curve' if job == "sweep" else 'beat']
+    _worker['renderer'] = RasterRenderer(width, height, background)
+    _worker['options'] = options
+    if block_name is not None:
+        _worker['block'] = shared_memory.SharedMemory(name=block_name)
+        _worker['curves'] = _worker['block'].buf.cast("d")
+        _worker['row_length'] = row_length
+    if job == "sweep":
+        scene = CurveScene(_worker['renderer'], options['rainbow_bands'])
+        scene.rainbow_mode = options['rainbow']
+        scene.glow_enabled = options['glow']
+        _worker['scene'] = scene
+    else:
+        # One scene per process: its keyframe cache and the curve grids
+        # outlive the individual beat cycles
+        _worker['scene'] = BeatScene(_worker['renderer'], options['fps'],
+                                     options['sampling'], options['tolerance'])
+
+
+def _render_sweep_frame(index):
+    """Render frame `index` of the k sweep from the shared curves"""
+    renderer = _worker['renderer']
+    row_length = _worker['row_length']
+    coords = _worker['curves'][index * row_length:(index + 1) * row_length].tolist()
+    _worker['scene'].draw_curve(coords)
+    return [encode(_worker['options']['format'], renderer.width, renderer.height, renderer.frame())]
+
+
+def _render_beat_cycle(bpm):
+    """Render one beat at `bpm`, after the pulse waves have reached a steady state"""
+    options = _worker['options']
+    renderer = _worker['renderer']
+    scene = _worker['scene']
+    # Start from a quiet heart, as a fresh scene would
+    scene.beats = 0.0
+    scene.waves.clear()
+    # A whole number of frames per beat, so the cycle loops seamlessly
+    frames = max(1, int(round(options['fps'] * 60.0 / bpm)))
+    dt = 60.0 / bpm / frames
+    # Waves only live a few seconds: after `warmup` seconds of whole beats
+    # every beat looks the same
+    for _ in range(frames * int(math.ceil(options['warmup'] * bpm / 60.0))):
+        scene.step(dt, bpm)
+    encoded = []
+    for _ in range(frames):
+        scene.step(dt, bpm)
+        encoded.append(encode(options['format'], renderer.width, renderer.height, renderer.frame()))
+    return encoded
+
+
+def load_progress(output, settings):
+    """Tasks already written by an earlier run with the same settings"""
+    path = os.path.join(output, PROGRESS_FILE)
+    try:
+        with open(path) as f:
+            progress = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if progress.get('settings') != settings:
+        return 0
+    return progress.get('done', 0)
+
+
+def save_progress(output, settings, done):
+    """Record progress atomically, so a crash never leaves a broken file"""
+    path = os.path.join(output, PROGRESS_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump({'settings': settings, 'done': done}, f)
+    os.replace(path + ".tmp", path)
+
+
+def export(job, output, workers=None, fmt="png", rainbow=False, glow=True, rainbow_bands=36,
+           steps=1000, bpm_min=40, bpm_max=150, fps=20, sampling="adaptive", tolerance=0.5,
+           warmup=3.0, log=print):
+    """Render a job's frames on `workers` processes into `output`; returns the frames written"""
+    os.makedirs(output, exist_ok=True)
+    options = {
+        'format': fmt, 'rainbow': rainbow, 'glow': glow, 'rainbow_bands': rainbow_bands,
+        'fps': fps, 'sampling': sampling, 'tolerance': tolerance, 'warmup': warmup,
+    }
+    block = None
+    if job == "sweep":
+        ks = sweep_ks()
+        tasks = list(range(len(ks)))
+        settings = dict(options, job=job, steps=steps)
+        block, row_length = share_curves(ks, steps)
+        initargs = (job, options, block.name, row_length)
+        render = _render_sweep_frame
+        writers = [FrameWriter(os.path.join(output, f"k_%03d.{fmt}"))] * len(tasks)
+    elif job == "beats":
+        tasks = list(range(bpm_min, bpm_max + 1))
+        settings = dict(options, job=job)
+        initargs = (job, options)
+        render = _render_beat_cycle
+        writers = [FrameWriter(os.path.join(output, f"bpm_{bpm:03d}_%03d.{fmt}")) for bpm in tasks]
+    else:
+        raise ValueError(f"unknown export job {job!r}")
+
+    done = load_progress(output, settings)
+    if done:
+        log(f"resuming after {done} of {len(tasks)} tasks")
+    started = time.perf_counter()
+    written = 0
+    try:
+        with Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            # imap hands back results in task order while later tasks are
+            # still rendering, so frames are written in order as they arrive
+            results = pool.imap(render, tasks[done:], chunksize=1)
+            for task_index, frames in enumerate(results, start=done):
+                writer = writers[task_index]
+                for frame_index, data in enumerate(frames):
+                    writer.write_encoded(data, task_index if job == "sweep" else frame_index)
+                written += len(frames)
+                save_progress(output, settings, task_index + 1)
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
+    elapsed = time.perf_counter() - started
+    log(f"{written} frames in {elapsed:.2f} s ({written / elapsed if elapsed else 0:.1f} frames/s, "
+        f"{workers or os.cpu_count()} workers)")
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Export heart animation frames on all cores")
+    parser.add_argument("job", choices=["sweep", "beats"], help="sweep: k = 1 .. 50 of heart2; beats: one beat cycle per BPM of heart1")
+    parser.add_argument("--output", default="export", help="directory for the frames and progress file")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--format", choices=["png", "ppm"], default="png", help="image format of the frames")
+    parser.add_argument("--rainbow", action="store_true", help="rainbow mode for the sweep")
+    parser.add_argument("--no-glow", action="store_true", help="turn off the sweep glow")
+    parser.add_argument("--rainbow-bands", type=int, default=36, help="hue bands in rainbow mode (0: one hue per segment)")
+    parser.add_argument("--steps", type=int, default=1000, help="x steps of the sweep curves")
+    parser.add_argument("--bpm-min", type=int, default=40, help="lowest BPM of the beat cycles")
+    parser.add_argument("--bpm-max", type=int, default=150, help="highest BPM of the beat cycles")
+    parser.add_argument("--fps", type=int, default=20, help="frame rate of the beat cycles")
+    parser.add_argument("--sampling", choices=["adaptive", "uniform"], default="adaptive", help="vertex placement along the beat cycle hearts")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="max distance in pixels between the drawn line and the curve (adaptive sampling)")
+    args = parser.parse_args()
+    if args.tolerance <= 0:
+        parser.error("--tolerance must be positive")
+    if args.rainbow_bands < 0:
+        parser.error("--rainbow-bands must not be negative")
+    export(args.job, args.output, args.workers, args.format, args.rainbow, not args.no_glow,
+           args.rainbow_bands, args.steps, args.bpm_min, args.bpm_max, args.fps,
+           args.sampling, args.tolerance)
@@ -0,0 +1,189 @@
+import asyncio
+import collections
+import os
+import random
+import socket
+import stat
+import sys
+import time
+
+# Live heart rate input for heart1.py. A sensor daemon, or anything standing
+# in for one, writes one reading per line to a Unix socket that heart1
+# listens on or to a FIFO:
+#
+#   72
+#   74 81234.567891     <- optional: time.monotonic() when it was sent
+#
+# Lines are read on the asyncio loop, so waiting for input never blocks the
+# animation. The newest reading is applied on the next frame; readings that
+# arrive in between are superseded. Latency runs from the send time when the
+# line carries one, otherwise from when it was read, to the flush of the
+# first frame drawn with the new BPM.
+
+BPM_MIN = 40
+BPM_MAX = 150
+
+
+def parse_reading(line):
+    """(bpm, sent_at or None) for a line, or None if it is not a reading"""
+    fields = line.split()
+    if not 1 <= len(fields) <= 2:
+        return None
+    try:
+        bpm = float(fields[0])
+        sent_at = float(fields[1]) if len(fields) == 2 else None
+    except ValueError:
+        return None
+    if bpm != bpm:  # NaN
+        return None
+    return min(BPM_MAX, max(BPM_MIN, int(round(bpm)))), sent_at
+
+
+def percentile(values, fraction):
+    """The value at `fraction` (0 .. 1) of the way through the sorted values"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class LiveBpm:
+    """Heart rate readings from a Unix socket and/or FIFO, newest first
+
+    listen() starts reading on the running asyncio loop. Each frame the
+    animation calls take() for the reading to apply (if a new one arrived)
+    and, once that frame is on screen, displayed() with the reading's
+    timestamp. Latencies are kept for the most recent `window` readings.
+    """
+
+    def __init__(self, window=10000):
+        self.latest = None  # (bpm, since) not applied yet
+        self.received = 0
+        self.superseded = 0  # replaced by a newer reading before a frame used them
+        self.rejected = 0  # lines that were not readings
+        self.latencies = collections.deque(maxlen=window)
+        self.server = None
+        self.tasks = []
+        self.fifo = None
+
+    def feed(self, line):
+        """Take in one line of input"""
+        reading = parse_reading(line)
+        if reading is None:
+            self.rejected += 1
+            return
+        bpm, sent_at = reading
+        if self.latest is not None:
+            self.superseded += 1
+        self.latest = (bpm, time.monotonic() if sent_at is None else sent_at)
+        self.received += 1
+
+    def take(self):
+        """The reading to apply on this frame as (bpm, since), or None"""
+        latest = self.latest
+        self.latest = None
+        return latest
+
+    def displayed(self, since):
+        """A frame drawn with the reading from `since` has been flushed"""
+        self.latencies.append(time.monotonic() - since)
+
+    async def pump(self, reader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            self.feed(line.decode("ascii", "replace"))
+
+    async def serve(self, reader, writer):
+        try:
+            await self.pump(reader)
+        finally:
+            writer.close()
+
+    async def listen(self, socket_path=None, fifo_path=None):
+        """Start reading from a Unix socket (any number of senders) and/or a FIFO"""
+        if socket_path is not None:
+            # A socket left behind by an earlier run would make bind() fail
+            if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                os.unlink(socket_path)
+            self.server = await asyncio.start_unix_server(self.serve, socket_path)
+        if fifo_path is not None:
+            if not os.path.exists(fifo_path):
+                os.mkfifo(fifo_path)
+            # Opened read-write so the FIFO never reports end of file when a
+            # writer goes away; the next writer just continues the stream
+            self.fifo = os.fdopen(os.open(fifo_path, os.O_RDWR | os.O_NONBLOCK), "rb", buffering=0)
+            reader = asyncio.StreamReader()
+            await asyncio.get_running_loop().connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader), self.fifo)
+            self.tasks.append(asyncio.ensure_future(self.pump(reader)))
+
+    async def close(self):
+        """Stop reading"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+        if self.fifo is not None:
+            self.fifo.close()
+            self.fifo = None
+
+    def summary(self):
+        """One line on the readings and their input-to-display latency"""
+        text = f"{self.received} readings, {self.superseded} superseded, {self.rejected} rejected"
+        if self.latencies:
+            latencies = self.latencies
+            text += (f"; latency p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+                     f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, "
+                     f"max {max(latencies) * 1000:.1f} ms")
+        return text
+
+
+def send(rate, duration, socket_path=None, fifo_path=None, bpm=72.0, out=None):
+    """Stand-in for the sensor daemon: a wandering heart rate, `rate` readings per second"""
+    if socket_path is not None:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+        write = connection.sendall
+    else:
+        connection = open(fifo_path, "wb", buffering=0)
+        write = connection.write
+    started = time.monotonic()
+    sent = 0
+    try:
+        while True:
+            now = time.monotonic()
+            if duration is not None and now - started >= duration:
+                break
+            # Every reading due by now, in one write
+            due = int((now - started) * rate) + 1 - sent
+            if due > 0:
+                lines = []
+                for _ in range(due):
+                    bpm = min(BPM_MAX, max(BPM_MIN, bpm + random.uniform(-1.0, 1.0)))
+                    lines.append(f"{bpm:.1f} {now:.6f}\n")
+                write("".join(lines).encode("ascii"))
+                sent += due
+            time.sleep(min(0.001, 1.0 / rate))
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    finally:
+        connection.close()
+    if out is not None:
+        out.write(f"sent {sent}\n")
+    return sent
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Send a simulated heart rate to heart1.py --bpm-socket / --bpm-fifo")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--socket", help="Unix socket heart1 listens on")
+    target.add_argument("--fifo", help="FIFO heart1 reads")
+    parser.add_argument("--rate", type=float, default=1.0, help="readings per second")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds (default: run until heart1 exits)")
+    parser.add_argument("--bpm", type=float, default=72.0, help="starting heart rate")
+    args = parser.parse_args()
+    send(args.rate, args.duration, args.socket, args.fifo, args.bpm, sys.stdout)
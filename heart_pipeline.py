@@ -0,0 +1,160 @@
+import collections
+import math
+import threading
+import time
+
+# Drawing calls that replace a layer's contents; anything a layer received
+# before its last replacement is dead once frames are merged
+REPLACING = ("draw", "draw_runs", "clear")
+
+
+class FrameRecorder:
+    """Renderer stand-in that records drawing calls instead of making them
+
+    A scene drawing onto a FrameRecorder from a worker thread produces a
+    frame buffer (the list of calls) that the Tk thread later replays onto
+    the real renderer with replay().
+    """
+
+    def __init__(self):
+        self.ops = []
+        self.layers = []
+        self.tk_calls = 0
+
+    def add_layer(self, name, width=1):
+        self.layers.append(name)
+        self.ops.append(("add_layer", name, width))
+
+    def draw(self, name, coords, color, width=None):
+        self.ops.append(("draw", name, coords, color, width))
+
+    def draw_runs(self, name, runs, width=None):
+        self.ops.append(("draw_runs", name, runs, width))
+
+    def append(self, name, coords, color, width=None):
+        self.ops.append(("append", name, coords, color, width))
+
+    def extend(self, name, coords):
+        self.ops.append(("extend", name, coords))
+
+    def clear(self, name):
+        self.ops.append(("clear", name))
+
+    def clear_all(self):
+        for name in self.layers:
+            self.clear(name)
+
+    def update(self):
+        pass
+
+    def take(self):
+        """The calls recorded since the last take()"""
+        ops = self.ops
+        self.ops = []
+        return ops
+
+
+def replay(ops, renderer):
+    """Make the recorded calls on a real renderer"""
+    for op in ops:
+        getattr(renderer, op[0])(*op[1:])
+
+
+def squash(frames):
+    """Merge consecutive frame buffers into one, dropping calls that a later
+    call on the same layer makes pointless"""
+    ops = [op for frame in frames for op in frame]
+    last_replace = {}
+    for i, op in enumerate(ops):
+        if op[0] in REPLACING:
+            last_replace[op[1]] = i
+    return [op for i, op in enumerate(ops)
+            if op[0] == "add_layer" or i >= last_replace.get(op[1], 0)]
+
+
+class FramePipeline:
+    """Computes frames on a worker thread ahead of the Tk thread
+
+    produce(target_time, dt) runs on the worker and returns the frame
+    buffer for that point in time (usually a FrameRecorder's calls).
+    Target times follow the frame clock's grid, one frame_time apart. At
+    most `depth` finished frames wait in the ring; when it is full the
+    worker waits (backpressure). take() hands the Tk thread the newest
+    frame that is due, merged with any older ones it skipped, so stale
+    geometry is never drawn. A worker that falls behind real time skips
+    ahead to the present instead of computing frames nobody will see.
+    """
+
+    def __init__(self, produce, frame_time, depth=2):
+        self.produce = produce
+        self.frame_time = frame_time
+        self.depth = depth
+        self.ready = collections.deque()
+        self.condition = threading.Condition()
+        self.thread = None
+        self.stopped = False
+        self.next_time = None
+        self.compute_time = 0.0  # seconds the worker spent on its last frame
+        self.produced = 0
+        self.discarded = 0  # frames computed but superseded before display
+        self.skipped = 0  # frame times the worker never computed
+
+    def start(self, now=None):
+        """Start the worker; the first frame is for one frame time from now"""
+        if now is None:
+            now = time.perf_counter()
+        self.next_time = now + self.frame_time
+        self.thread = threading.Thread(target=self._run, name="frame-pipeline", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        last = None
+        while True:
+            with self.condition:
+                while len(self.ready) >= self.depth and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                target = self.next_time
+                behind = time.perf_counter() - target
+                if behind > self.frame_time:
+                    missed = int(math.floor(behind / self.frame_time))
+                    target += missed * self.frame_time
+                    self.skipped += missed
+                self.next_time = target + self.frame_time
+            dt = self.frame_time if last is None else target - last
+            last = target
+
+            started = time.perf_counter()
+            ops = self.produce(target, dt)
+            self.compute_time = time.perf_counter() - started
+
+            with self.condition:
+                self.ready.append((target, ops))
+                self.produced += 1
+                self.condition.notify_all()
+
+    def take(self, now=None):
+        """Frame buffer of the newest frame due by `now`, or None if none is ready"""
+        if now is None:
+            now = time.perf_counter()
+        due = []
+        with self.condition:
+            # Half a frame of slack: a frame for the upcoming deadline counts as due
+            while self.ready and self.ready[0][0] <= now + self.frame_time / 2:
+                due.append(self.ready.popleft()[1])
+            if due:
+                self.condition.notify_all()
+        if not due:
+            return None
+        self.discarded += len(due) - 1
+        return due[0] if len(due) == 1 else squash(due)
+
+    def stop(self):
+        """Stop the worker and wait for it"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
@@ -0,0 +1,94 @@
+import json
+import time
+
+
+class FrameProfiler:
+    """Optional per-frame instrumentation of the animation hot path
+
+    A frame is bracketed by begin() and end(). In between, mark(phase) adds
+    the time since the previous mark to that phase (so interleaved geometry
+    and drawing work is split correctly) and end() takes any extra fields
+    such as call counts. Finished frames go to a JSON-lines file and/or a
+    text item on the canvas.
+
+    Callers check `enabled` once per frame and skip all of this otherwise,
+    so a disabled profiler costs one attribute lookup per frame.
+    """
+
+    def __init__(self, canvas=None, log_path=None, overlay_interval=0.25):
+        self.canvas = canvas
+        # Line-buffered, so the frames before a crash or kill are on disk
+        self.log = open(log_path, "a", buffering=1) if log_path else None
+        self.overlay_item = None  # created on first use, then hidden and shown
+        self.overlay_visible = False
+        self.overlay_interval = overlay_interval
+        self.overlay_updated = 0.0
+        self.frames = 0
+        self.frame = None
+        self.last_mark = 0.0
+        self.last_begin = None
+        self.enabled = self.log is not None
+
+    def begin(self, source):
+        """Start timing a frame"""
+        now = time.perf_counter()
+        self.frame = {
+            'frame': self.frames,
+            'source': source,
+            'time': now,
+            'interval_ms': (now - self.last_begin) * 1000 if self.last_begin else None,
+        }
+        self.last_begin = now
+        self.last_mark = now
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to a phase"""
+        now = time.perf_counter()
+        key = phase + '_ms'
+        self.frame[key] = self.frame.get(key, 0.0) + (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def end(self, **fields):
+        """Finish the frame and publish it"""
+        frame = self.frame
+        frame.update(fields)
+        frame['total_ms'] = (time.perf_counter() - frame['time']) * 1000
+        self.frames += 1
+        if self.log is not None:
+            self.log.write(json.dumps(frame) + "\n")
+        if self.overlay_visible and frame['time'] - self.overlay_updated >= self.overlay_interval:
+            self.overlay_updated = frame['time']
+            self.canvas.itemconfigure(self.overlay_item, text=self.format(frame))
+
+    def format(self, frame):
+        """Overlay text for a frame"""
+        lines = []
+        if frame.get('interval_ms'):
+            lines.append(f"fps      {1000 / frame['interval_ms']:6.1f}")
+        for key in ('geometry_ms', 'draw_ms', 'update_ms', 'total_ms'):
+            if key in frame:
+                lines.append(f"{key[:-3]:<8} {frame[key]:6.2f} ms")
+        for key in ('tk_calls', 'waves', 'late_ms', 'dropped'):
+            if key in frame:
+                lines.append(f"{key:<8} {frame[key]:6g}")
+        if 'cache_hits' in frame:
+            lines.append(f"cache    {frame['cache_hits']:6g} hits {frame['cache_misses']:g} misses")
+        return "\n".join(lines)
+
+    def toggle_overlay(self, event=None):
+        """Show or hide the on-canvas statistics"""
+        if self.overlay_item is None:
+            width = int(self.canvas.cget("width"))
+            height = int(self.canvas.cget("height"))
+            self.overlay_item = self.canvas.create_text(
+                -width // 2 + 10, -height // 2 + 10, anchor="nw",
+                fill="#00FF00", font=("Courier", 10), text="profiling...")
+        self.overlay_visible = not self.overlay_visible
+        self.canvas.itemconfigure(self.overlay_item, state="normal" if self.overlay_visible else "hidden")
+        self.enabled = self.log is not None or self.overlay_visible
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+        self.enabled = self.overlay_visible
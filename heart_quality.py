@@ -0,0 +1,99 @@
+import time
+
+# Quality levels, from full quality (0) down to the cheapest (last).
+#   heart_steps  - vertices on the main beating heart
+#   wave_steps   - vertices on a bright pulse wave
+#   faded_steps  - vertices on a pulse wave that has faded below half opacity
+#   max_waves    - pulse waves drawn at once (None: no limit)
+#   glow_layers  - glow passes under the heart2 curve (composited into one
+#                  item, so 0 turns the glow off and any other value on)
+#   curve_steps  - x steps for the heart2 curve when it is not being played
+#   tolerance    - multiplier on the pixel tolerance used by adaptive sampling
+#                  (the *_steps settings apply to uniform sampling)
+QUALITY_LEVELS = [
+    {'heart_steps': 100, 'wave_steps': 100, 'faded_steps': 100, 'max_waves': None, 'glow_layers': 3, 'curve_steps': 300, 'tolerance': 1.0},
+    {'heart_steps': 100, 'wave_steps': 64, 'faded_steps': 40, 'max_waves': None, 'glow_layers': 2, 'curve_steps': 300, 'tolerance': 1.5},
+    {'heart_steps': 80, 'wave_steps': 48, 'faded_steps': 24, 'max_waves': 6, 'glow_layers': 1, 'curve_steps': 240, 'tolerance': 2.0},
+    {'heart_steps': 64, 'wave_steps': 32, 'faded_steps': 16, 'max_waves': 3, 'glow_layers': 1, 'curve_steps': 180, 'tolerance': 3.0},
+    {'heart_steps': 48, 'wave_steps': 24, 'faded_steps': 12, 'max_waves': 1, 'glow_layers': 0, 'curve_steps': 120, 'tolerance': 4.0},
+]
+
+
+class QualityGovernor:
+    """Trade drawing detail for frame rate
+
+    record() is fed the measured work time of every frame. When the smoothed
+    frame time stays above the budget (1 / target fps) for degrade_after
+    frames the quality level drops one step; when it stays below
+    headroom * budget for restore_after frames it goes back up one step.
+
+    An app that stops drawing (nothing changes on screen) stops feeding
+    samples, so idle() steps the level back up once per idle_restore
+    seconds without any; the next frame drawn then measures that level.
+    """
+
+    def __init__(self, fps=30, levels=QUALITY_LEVELS, degrade_after=5,
+                 restore_after=60, headroom=0.5, idle_restore=1.0, enabled=True):
+        self.levels = levels
+        self.level = 0
+        self.degrade_after = degrade_after
+        self.restore_after = restore_after
+        self.headroom = headroom
+        self.idle_restore = idle_restore
+        self.last_sample = None
+        self.enabled = enabled
+        self.average = None
+        self.over = 0
+        self.under = 0
+        self.fps = fps
+        self.budget = 1.0 / fps
+
+    @property
+    def quality(self):
+        """Settings of the current level"""
+        return self.levels[self.level]
+
+    def record(self, frame_seconds):
+        """Feed one frame's work time; returns True if the level changed"""
+        self.last_sample = time.perf_counter()
+        if self.average is None:
+            self.average = frame_seconds
+        else:
+            self.average += 0.2 * (frame_seconds - self.average)
+        if not self.enabled:
+            return False
+
+        if self.average > self.budget:
+            self.over += 1
+            self.under = 0
+            if self.over >= self.degrade_after and self.level < len(self.levels) - 1:
+                self.level += 1
+                self.over = 0
+                return True
+        elif self.average < self.budget * self.headroom:
+            self.under += 1
+            self.over = 0
+            if self.under >= self.restore_after and self.level > 0:
+                self.level -= 1
+                self.under = 0
+                return True
+        else:
+            self.over = 0
+            self.under = 0
+        return False
+
+    def idle(self):
+        """Step up one level if no frame was recorded for idle_restore seconds;
+        returns True if the level changed"""
+        if not self.enabled or self.level == 0:
+            return False
+        now = time.perf_counter()
+        if self.last_sample is not None and now - self.last_sample < self.idle_restore:
+            return False
+        self.level -= 1
+        self.last_sample = now
+        # The old average was measured at the lower level
+        self.average = None
+        self.over = 0
+        self.under = 0
+        return True
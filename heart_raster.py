@@ -0,0 +1,363 @@
+import math
+import struct
+import sys
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Longest line piece rasterized in one go, in pixels; longer segments are
+# split so every piece fits a small fixed-size pixel window
+MAX_PIECE = 16.0
+
+
+def parse_color(color):
+    """(r, g, b) for a "#rrggbb" color"""
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+class RasterRenderer:
+    """Offscreen drawing into an RGB buffer, with the CanvasRenderer interface
+
+    Layers keep their runs the same way the Canvas keeps its items, so the
+    scenes in heart_scenes draw onto either renderer unchanged. update()
+    composites every layer, in order, onto the background: each run is an
+    anti-aliased polyline with round caps and joins (pixel coverage from
+    the distance to the nearest segment). No Tk is involved, so frames can
+    be rendered on machines without a display.
+    """
+
+    def __init__(self, width, height, background="#000000"):
+        self.width = width
+        self.height = height
+        self.background = parse_color(background)
+        self.layers = {}
+        self.tk_calls = 0  # drawing calls, comparable with CanvasRenderer's count
+        self.changed = True
+        self.pixels = None
+        self._colors = {}
+        if np is not None:
+            self._coverage = np.zeros((height, width), dtype=np.float32)
+
+    def add_layer(self, name, width=1):
+        """Create a layer; layers added later are drawn on top"""
+        self.layers[name] = {'runs': [], 'width': width}
+
+    def draw(self, name, coords, color, width=None):
+        """Replace a layer's polyline with new coordinates and style"""
+        return self.draw_runs(name, [(coords, color)], width)
+
+    def draw_runs(self, name, runs, width=None):
+        """Replace a layer with (coords, color) or (coords, color, width) runs"""
+        layer = self.layers[name]
+        if width is None:
+            width = layer['width']
+        layer['runs'] = [(run[0], run[1], run[2] if len(run) > 2 else width)
+                         for run in runs if len(run[0]) >= 4]
+        self.tk_calls += 1
+        self.changed = True
+        return True
+
+    def append(self, name, coords, color, width=None):
+        """Add one more run to a layer"""
+        layer = self.layers[name]
+        layer['runs'].append((coords, color, layer['width'] if width is None else width))
+        self.tk_calls += 1
+        self.changed = True
+
+    def extend(self, name, coords):
+        """Continue a layer's newest run; coords start at the point where it ends"""
+        runs = self.layers[name]['runs']
+        drawn, color, width = runs[-1]
+        runs[-1] = (drawn + coords[2:], color, width)
+        self.tk_calls += 1
+        self.changed = True
+
+    def clear(self, name):
+        """Hide a layer"""
+        if self.layers[name]['runs']:
+            self.layers[name]['runs'] = []
+            self.changed = True
+
+    def clear_all(self):
+        """Hide every layer"""
+        for name in self.layers:
+            self.clear(name)
+
+    def update(self):
+        """Rasterize the layers; skipped when nothing was drawn since the last update"""
+        if not self.changed and self.pixels is not None:
+            return False
+        if np is not None:
+            self.pixels = np.empty((self.height, self.width, 3), dtype=np.float32)
+            self.pixels[:] = self.background
+        else:
+            self.pixels = bytearray(bytes(self.background) * (self.width * self.height))
+        for layer in self.layers.values():
+            for coords, color, width in layer['runs']:
+                self.stroke(coords, self.color(color), width)
+        self.changed = False
+        return True
+
+    def color(self, color):
+        rgb = self._colors.get(color)
+        if rgb is None:
+            rgb = self._colors[color] = parse_color(color)
+        return rgb
+
+    def frame(self):
+        """The current frame as packed 8-bit RGB rows"""
+        self.update()
+        if np is not None:
+            return np.clip(self.pixels + 0.5, 0, 255).astype(np.uint8).tobytes()
+        return bytes(self.pixels)
+
+    def stroke(self, coords, rgb, width):
+        """Blend one polyline into the pixels"""
+        if np is not None:
+            self._stroke_numpy(coords, rgb, width)
+        else:
+            self._stroke_python(coords, rgb, width)
+
+    def _stroke_numpy(self, coords, rgb, width):
+        # Canvas coordinates have (0, 0) in the middle of the frame
+        points = np.asarray(coords, dtype=float).reshape(-1, 2) + (self.width / 2, self.height / 2)
+        a = points[:-1]
+        ab = points[1:] - a
+
+        # Split long segments into pieces of at most MAX_PIECE pixels
+        pieces = np.maximum(1, np.ceil(np.hypot(ab[:, 0], ab[:, 1]) / MAX_PIECE)).astype(int)
+        if pieces.max() > 1:
+            index = np.repeat(np.arange(len(a)), pieces)
+            part = np.arange(len(index)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+            ab = ab[index] / pieces[index, None]
+            a = a[index] + ab * part[:, None]
+
+        # One pixel window per piece, all of the same size: enough for the
+        # largest piece plus the line width on both sides
+        radius = width / 2
+        extent_x, extent_y = np.abs(ab).max(axis=0)
+        x0 = np.floor(np.minimum(a[:, 0], a[:, 0] + ab[:, 0]) - radius - 1).astype(int)
+        y0 = np.floor(np.minimum(a[:, 1], a[:, 1] + ab[:, 1]) - radius - 1).astype(int)
+        px = x0[:, None, None] + np.arange(int(math.ceil(extent_x + 2 * radius)) + 3)[None, None, :]
+        py = y0[:, None, None] + np.arange(int(math.ceil(extent_y + 2 * radius)) + 3)[None, :, None]
+
+        # Distance from every pixel center to its piece
+        dx = px + 0.5 - a[:, 0, None, None]
+        dy = py + 0.5 - a[:, 1, None, None]
+        abx = ab[:, 0, None, None]
+        aby = ab[:, 1, None, None]
+        length2 = np.maximum(abx * abx + aby * aby, 1e-12)
+        t = np.clip((dx * abx + dy * aby) / length2, 0.0, 1.0)
+        distance = np.hypot(dx - t * abx, dy - t * aby)
+        coverage = np.clip(radius + 0.5 - distance, 0.0, 1.0)
+
+        px, py = np.broadcast_arrays(px, py)
+        inside = (coverage > 0) & (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height)
+        if not inside.any():
+            return
+        px = px[inside]
+        py = py[inside]
+        # Where pieces overlap (joins) a pixel keeps its strongest coverage,
+        # so the line is blended once and joins do not get darker
+        np.maximum.at(self._coverage, (py, px), coverage[inside])
+
+        top, bottom = py.min(), py.max() + 1
+        left, right = px.min(), px.max() + 1
+        alpha = self._coverage[top:bottom, left:right, None]
+        region = self.pixels[top:bottom, left:right]
+        region += (np.asarray(rgb, dtype=np.float32) - region) * alpha
+        alpha[:] = 0
+
+    def _stroke_python(self, coords, rgb, width):
+        half_width = self.width / 2
+        half_height = self.height / 2
+        radius = width / 2
+        reach = radius + 0.5
+        coverage = {}
+        for i in range(0, len(coords) - 2, 2):
+            ax = coords[i] + half_width
+            ay = coords[i + 1] + half_height
+            abx = coords[i + 2] + half_width - ax
+            aby = coords[i + 3] + half_height - ay
+            length2 = max(abx * abx + aby * aby, 1e-12)
+            left = max(0, int(math.floor(min(ax, ax + abx) - reach)))
+            right = min(self.width, int(math.ceil(max(ax, ax + abx) + reach)) + 1)
+            top = max(0, int(math.floor(min(ay, ay + aby) - reach)))
+            bottom = min(self.height, int(math.ceil(max(ay, ay + aby) + reach)) + 1)
+            for y in range(top, bottom):
+                dy = y + 0.5 - ay
+                row = y * self.width
+                for x in range(left, right):
+                    dx = x + 0.5 - ax
+                    t = (dx * abx + dy * aby) / length2
+                    t = 0.0 if t < 0 else 1.0 if t > 1 else t
+                    ex = dx - t * abx
+                    ey = dy - t * aby
+                    value = reach - math.sqrt(ex * ex + ey * ey)
+                    if value > 0:
+                        value = min(value, 1.0)
+                        if value > coverage.get(row + x, 0.0):
+                            coverage[row + x] = value
+
+        pixels = self.pixels
+        r, g, b = rgb
+        for pixel, alpha in coverage.items():
+            i = 3 * pixel
+            pixels[i] = int(pixels[i] + (r - pixels[i]) * alpha + 0.5)
+            pixels[i + 1] = int(pixels[i + 1] + (g - pixels[i + 1]) * alpha + 0.5)
+            pixels[i + 2] = int(pixels[i + 2] + (b - pixels[i + 2]) * alpha + 0.5)
+
+
+def encode_ppm(width, height, rgb):
+    """Binary PPM (P6) image"""
+    return b"P6\n%d %d\n255\n" % (width, height) + rgb
+
+
+def encode_png(width, height, rgb, level=6):
+    """RGB PNG image (standard library only)"""
+    stride = 3 * width
+    raw = b"".join(b"\x00" + rgb[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, level))
+            + chunk(b"IEND", b""))
+
+
+class FrameWriter:
+    """Streams rendered frames to image files or a raw RGB pipe
+
+    `output` is a file name pattern with a frame number placeholder
+    ("frames/heart_%05d.png"), a single file name, or "-" for raw RGB
+    frames on stdout, ready for e.g.
+    ffmpeg -f rawvideo -pix_fmt rgb24 -s WxH -r FPS -i - out.mp4
+    The format follows the extension: .png, .ppm, or anything else for raw.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        if output == "-":
+            self.format = "raw"
+        elif output.lower().endswith(".png"):
+            self.format = "png"
+        elif output.lower().endswith(".ppm"):
+            self.format = "ppm"
+        else:
+            self.format = "raw"
+        self.stream = None
+        if self.format == "raw":
+            self.stream = sys.stdout.buffer if output == "-" else open(output, "wb")
+        self.frames = 0
+
+    def path(self, index):
+        """File name of frame `index`"""
+        if "%" in self.output:
+            return self.output % index
+        return self.output
+
+    def encode(self, width, height, rgb):
+        if self.format == "png":
+            return encode_png(width, height, rgb)
+        if self.format == "ppm":
+            return encode_ppm(width, height, rgb)
+        return rgb
+
+    def write(self, renderer, index=None):
+        """Write the renderer's current frame"""
+        self.write_encoded(self.encode(renderer.width, renderer.height, renderer.frame()), index)
+
+    def write_encoded(self, data, index=None):
+        """Write an already encoded frame"""
+        if index is None:
+            index = self.frames
+        if self.stream is not None:
+            self.stream.write(data)
+        else:
+            with open(self.path(index), "wb") as f:
+                f.write(data)
+        self.frames += 1
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.flush()
+            if self.stream is not sys.stdout.buffer:
+                self.stream.close()
+            self.stream = None
+
+
+# Frame size and background of each scene, as in the Tk apps
+SCENE_SIZES = {
+    'beat': (850, 440, "#000000"),
+    'curve': (860, 550, "#0a0a0a"),
+    'nested': (600, 600, "#000000"),
+}
+
+
+def scene_frames(name, renderer, frames=1, fps=20, bpm=72, k=20.75, k_stop=None,
+                 rainbow=False, glow=True, sampling="adaptive", tolerance=0.5):
+    """Draw the frames of a scene onto a renderer, yielding after each one
+
+    beat:   the heart1 beating heart, stepped at `fps` for `frames` frames
+    curve:  the heart2 curve, with k swept linearly to `k_stop` if given
+    nested: the heart.py concentric hearts
+    """
+    import heart_scenes
+    if name == "beat":
+        scene = heart_scenes.BeatScene(renderer, fps, sampling, tolerance)
+        for _ in range(frames):
+            scene.step(1.0 / fps, bpm)
+            yield
+    elif name == "curve":
+        scene = heart_scenes.CurveScene(renderer)
+        scene.rainbow_mode = rainbow
+        scene.glow_enabled = glow
+        curve_sampling = ("adaptive", tolerance) if sampling == "adaptive" else ("uniform", 300)
+        for i in range(frames):
+            frame_k = k
+            if k_stop is not None and frames > 1:
+                frame_k = k + (k_stop - k) * i / (frames - 1)
+            scene.draw_heart(frame_k, curve_sampling)
+            yield
+    elif name == "nested":
+        renderer.add_layer("hearts", width=1)
+        renderer.draw_runs("hearts", [(coords, "#ff0000") for coords in heart_scenes.nested_hearts(tolerance=tolerance)])
+        for _ in range(frames):
+            yield
+    else:
+        raise ValueError(f"unknown scene {name!r}")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Render heart scenes offscreen, without Tk")
+    parser.add_argument("scene", choices=sorted(SCENE_SIZES), help="beat (heart1), curve (heart2) or nested (heart.py)")
+    parser.add_argument("--output", default="-", help="frame file pattern such as frames/%%05d.png, a .ppm/.png file, or - for raw RGB on stdout")
+    parser.add_argument("--frames", type=int, default=1, help="number of frames to render")
+    parser.add_argument("--fps", type=int, default=20, help="frame rate of the beat scene")
+    parser.add_argument("--bpm", type=int, default=72, help="heart rate of the beat scene")
+    parser.add_argument("--k", type=float, default=20.75, help="k of the curve scene")
+    parser.add_argument("--k-stop", type=float, help="sweep k up to this value over the frames")
+    parser.add_argument("--rainbow", action="store_true", help="rainbow mode for the curve scene")
+    parser.add_argument("--no-glow", action="store_true", help="turn off the curve glow")
+    parser.add_argument("--sampling", choices=["adaptive", "uniform"], default="adaptive", help="vertex placement along the curves")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="max distance in pixels between the drawn line and the curve (adaptive sampling)")
+    args = parser.parse_args()
+    if args.tolerance <= 0:
+        parser.error("--tolerance must be positive")
+
+    width, height, background = SCENE_SIZES[args.scene]
+    renderer = RasterRenderer(width, height, background)
+    writer = FrameWriter(args.output)
+    try:
+        for _ in scene_frames(args.scene, renderer, args.frames, args.fps, args.bpm, args.k,
+                              args.k_stop, args.rainbow, not args.no_glow, args.sampling, args.tolerance):
+            writer.write(renderer)
+    finally:
+        writer.close()
@@ -0,0 +1,134 @@
+import tkinter as tk
+
+
+class CanvasRenderer:
+    """Retained-mode drawing on a Tk Canvas
+
+    Every layer (a heart, a pulse wave, a glow pass) is a persistent Canvas
+    line item. A frame only pushes new coordinates and colours onto the
+    existing items instead of deleting and re-creating line segments.
+    Coordinates are flat lists as produced by heart_curves.canvas_coords.
+
+    Each item remembers the coordinates and style it was last given, and
+    calls that would not change anything are skipped: a heart at rest
+    costs no Canvas calls at all, and update() does nothing when no layer
+    changed. Coordinate lists are compared by identity first, so passing
+    the same (cached) list again is free; lists handed to the renderer
+    must not be modified afterwards.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        width = int(canvas.cget("width"))
+        height = int(canvas.cget("height"))
+        # Put (0, 0) in the middle of the canvas, the same way turtle does
+        canvas.config(scrollregion=(-width // 2, -height // 2, width // 2, height // 2))
+        self.layers = {}
+        self.drawn = {}  # item -> (coords, color, width) last pushed to it
+        self.tk_calls = 0  # Canvas calls issued, for profiling
+        self.flushed_calls = 0  # tk_calls at the last update()
+
+    def _create_item(self, width, above=None):
+        item = self.canvas.create_line(0, 0, 0, 0, fill="", width=width,
+                                       capstyle=tk.ROUND, joinstyle=tk.ROUND,
+                                       state=tk.HIDDEN)
+        self.tk_calls += 1
+        if above is not None:
+            self.canvas.tag_raise(item, above)
+            self.tk_calls += 1
+        return item
+
+    def _show(self, item, coords, color, width, visible):
+        """Give an item new coordinates and style; returns True if anything changed"""
+        drawn = self.drawn.get(item)
+        changed = False
+        if drawn is None or (drawn[0] is not coords and drawn[0] != coords):
+            self.canvas.coords(item, coords)
+            self.tk_calls += 1
+            changed = True
+        if not visible or drawn is None or drawn[1] != color or drawn[2] != width:
+            self.canvas.itemconfigure(item, fill=color, width=width, state=tk.NORMAL)
+            self.tk_calls += 1
+            changed = True
+        self.drawn[item] = (coords, color, width)
+        return changed
+
+    def add_layer(self, name, width=1):
+        """Create a layer; layers added later are drawn on top"""
+        self.layers[name] = {
+            'items': [self._create_item(width)],
+            'width': width,
+            'shown': 0,
+        }
+
+    def draw(self, name, coords, color, width=None):
+        """Replace a layer's polyline with new coordinates and style"""
+        return self.draw_runs(name, [(coords, color)], width)
+
+    def draw_runs(self, name, runs, width=None):
+        """Draw (coords, color) or (coords, color, width) runs, one Canvas item each
+
+        Returns True if the layer looks different afterwards.
+        """
+        layer = self.layers[name]
+        items = layer['items']
+        if width is None:
+            width = layer['width']
+        # A Canvas line needs at least two points
+        runs = [run for run in runs if len(run[0]) >= 4]
+        while len(items) < len(runs):
+            items.append(self._create_item(width, above=items[-1]))
+        
+        changed = False
+        for index, (item, run) in enumerate(zip(items, runs)):
+            run_width = run[2] if len(run) > 2 else width
+            changed |= self._show(item, run[0], run[1], run_width, index < layer['shown'])
+        
+        # Hide whatever the previous frame showed but this one did not need
+        hidden = items[len(runs):layer['shown']]
+        for item in hidden:
+            self.canvas.itemconfigure(item, state=tk.HIDDEN)
+        layer['shown'] = len(runs)
+        self.tk_calls += len(hidden)
+        return changed or bool(hidden)
+
+    def append(self, name, coords, color, width=None):
+        """Add one more run to a layer without touching what is already drawn"""
+        layer = self.layers[name]
+        items = layer['items']
+        if width is None:
+            width = layer['width']
+        if layer['shown'] == len(items):
+            items.append(self._create_item(width, above=items[-1]))
+        self._show(items[layer['shown']], coords, color, width, False)
+        layer['shown'] += 1
+
+    def extend(self, name, coords):
+        """Continue a layer's newest run; coords start at the point where it ends"""
+        layer = self.layers[name]
+        item = layer['items'][layer['shown'] - 1]
+        drawn, color, width = self.drawn[item]
+        # A new list, since the old one may be shared with the caller
+        self._show(item, drawn + coords[2:], color, width, True)
+
+    def clear(self, name):
+        """Hide a layer"""
+        layer = self.layers[name]
+        for item in layer['items'][:layer['shown']]:
+            self.canvas.itemconfigure(item, state=tk.HIDDEN)
+        self.tk_calls += layer['shown']
+        layer['shown'] = 0
+
+    def clear_all(self):
+        """Hide every layer"""
+        for name in self.layers:
+            self.clear(name)
+
+    def update(self):
+        """Flush pending drawing to the screen; skipped when nothing was drawn"""
+        if self.tk_calls == self.flushed_calls:
+            return False
+        self.canvas.update_idletasks()
+        self.tk_calls += 1
+        self.flushed_calls = self.tk_calls
+        return True
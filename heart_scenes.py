@@ -0,0 +1,451 @@
+import math
+import random
+import heart_curves
+from heart_curves import np
+from heart_cache import GeometryCache
+from heart_quality import QUALITY_LEVELS
+from heart_waves import WaveSystem
+
+# The scenes of heart.py, heart1.py and heart2.py without any Tk: each one
+# draws onto a renderer with the CanvasRenderer interface (add_layer, draw,
+# draw_runs, append, extend, clear), so the same frames can go to a Tk
+# Canvas or to the offscreen heart_raster.RasterRenderer.
+
+
+def beat_scale(beat_phase):
+    """Heart scale for a point in the beat cycle (lub-DUB pattern)"""
+    if beat_phase < 0.15:  # First beat (lub)
+        return 1.0 + (math.sin(beat_phase * math.pi / 0.15) * 0.3)
+    elif beat_phase < 0.25:  # Brief pause
+        return 1.0
+    elif beat_phase < 0.35:  # Second beat (DUB) - stronger
+        return 1.0 + (math.sin((beat_phase - 0.25) * math.pi / 0.1) * 0.4)
+    else:  # Relaxation
+        return 1.0
+
+
+def beat_scales(beat_phases):
+    """beat_scale for many phases at once"""
+    if np is None:
+        return [beat_scale(phase) for phase in beat_phases]
+    phases = np.asarray(beat_phases, dtype=float)
+    lub = 1.0 + np.sin(phases * math.pi / 0.15) * 0.3
+    dub = 1.0 + np.sin((phases - 0.25) * math.pi / 0.1) * 0.4
+    return np.where(phases < 0.15, lub, np.where((phases >= 0.25) & (phases < 0.35), dub, 1.0))
+
+
+class BeatScene:
+    """The beating heart of heart1.py with its expanding pulse waves"""
+
+    def __init__(self, renderer, fps=20, sampling="adaptive", tolerance=0.15,
+                 wave_capacity=64, echoes=1):
+        self.renderer = renderer
+
+        # Main heart layer, with all pulse waves drawn on top of it
+        renderer.add_layer("main", width=4)
+        renderer.add_layer("waves", width=3)
+
+        # Expanding pulse waves; `echoes` waves are sent out per beat
+        self.waves = WaveSystem(wave_capacity)
+        self.echoes = echoes
+
+        # Main heart keyframes for one beat cycle, per BPM (LRU across BPMs)
+        self.keyframes = GeometryCache(max_bytes=4 * 1024 * 1024)
+
+        # Wave color and width by opacity, precomputed instead of per wave per frame
+        self.pulse_colors = [self.get_pulse_color(i / 255) for i in range(256)]
+        self.pulse_widths = [max(1, int(4 * i / 255)) for i in range(256)]
+
+        self.beats = 0.0  # Beats elapsed; the fraction is the beat phase
+        self.fps = fps
+        # Vertex placement: "adaptive" (within tolerance pixels) or "uniform"
+        self.sampling = sampling
+        self.tolerance = tolerance
+
+    def heart_vertices(self, scales, steps=100, tolerance=None):
+        """Canvas coordinates for several heart scales, computed in batches
+
+        With a tolerance (in pixels) every size gets an adaptive parameter
+        grid, otherwise all of them use `steps` uniform steps. Scales that
+        share a grid are evaluated in one batch.
+        """
+        if tolerance is None:
+            grids = [heart_curves.param_grid(steps)] * len(scales)
+        else:
+            grids = [heart_curves.corazon_samples(4 * scale, tolerance) for scale in scales]
+        groups = {}
+        for i, grid in enumerate(grids):
+            groups.setdefault(id(grid), (grid, []))[1].append(i)
+
+        vertices = [None] * len(scales)
+        for grid, indices in groups.values():
+            xs_rows, ys_rows = heart_curves.heart_parametric_scales(grid, [scales[i] for i in indices])
+            for i, xs, ys in zip(indices, xs_rows, ys_rows):
+                vertices[i] = heart_curves.canvas_coords(xs, ys)
+        return vertices
+
+    def draw_heart(self, layer, scale, color, width, vertices=None):
+        """Draw a single heart at given scale"""
+        if vertices is None:
+            tolerance = self.tolerance if self.sampling == "adaptive" else None
+            vertices = self.heart_vertices([scale], tolerance=tolerance)[0]
+        self.renderer.draw(layer, vertices, color, width)
+
+    def get_pulse_color(self, opacity):
+        """Get color based on opacity"""
+        # Fade from bright pink to dark
+        r = int(255 * opacity)
+        g = int(20 * opacity)
+        b = int(102 * opacity)
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    def spawn_waves(self, scale):
+        """Send out a pulse wave, plus trailing echoes, from the heart's current size"""
+        # Faintest echo first so the leading wave is drawn on top
+        echoes = range(self.echoes - 1, -1, -1)
+        self.waves.spawn([scale * (1 - 0.25 * i / self.echoes) for i in echoes],
+                         [1.0 - 0.8 * i / self.echoes for i in echoes])
+
+    def beat_cycle(self, bpm, steps, tolerance):
+        """Keyframes of one beat at this BPM: (scales, vertices), one per frame
+
+        Cached per BPM and level of detail, so a steady beat only replays
+        precomputed frames; a new slider value simply misses the cache and
+        old BPMs age out of it.
+        """
+        frames = max(1, int(round(self.fps * 60.0 / bpm)))
+        key = (bpm, frames, self.sampling, steps, tolerance)
+        return self.keyframes.get(key, lambda: self.build_beat_cycle(frames, steps, tolerance))
+
+    def build_beat_cycle(self, frames, steps, tolerance):
+        """Compute the keyframes for a beat split into `frames` frames"""
+        scales = [self.beat_scale(i / frames) for i in range(frames)]
+        # Most of the beat is at rest (scale 1.0); each distinct scale is computed once
+        distinct = sorted(set(scales))
+        vertices = dict(zip(distinct, self.heart_vertices(distinct, steps, tolerance)))
+        return scales, [vertices[scale] for scale in scales]
+
+    def beat_scale(self, beat_phase):
+        """Main heart scale for a point in the beat cycle (lub-DUB pattern)"""
+        return beat_scale(beat_phase)
+
+    def step(self, dt, bpm, quality=QUALITY_LEVELS[0], prof=None):
+        """Advance the beat by dt seconds and draw the frame; returns the waves drawn"""
+        # Beat phase follows the real clock, so the rate matches the BPM
+        # however late individual frames are
+        previous = self.beats
+        self.beats += dt * bpm / 60.0
+
+        # Adaptive sampling tolerance in pixels (None: uniform steps)
+        tolerance = None
+        if self.sampling == "adaptive":
+            tolerance = self.tolerance * quality['tolerance']
+
+        # REAL HEARTBEAT PATTERN: lub-DUB (two beats), replayed from the
+        # keyframes of one cycle at this BPM
+        scales, cycle = self.beat_cycle(bpm, quality['heart_steps'], tolerance)
+        keyframe = int(round((self.beats % 1.0) * len(scales))) % len(scales)
+        scale = scales[keyframe]
+
+        # Expanding pulse waves, triggered when the phase passes lub (0.0) or DUB (0.25)
+        lub = math.floor(self.beats) > math.floor(previous)
+        dub = math.floor(self.beats - 0.25) > math.floor(previous - 0.25)
+        if lub or dub:
+            self.spawn_waves(scale)
+
+        # Expand and fade all waves in one batch
+        self.waves.update(dt)
+
+        # Draw only the newest waves the current quality level allows
+        scales = self.waves.scales
+        opacities = self.waves.opacities
+        max_waves = quality['max_waves']
+        if max_waves is not None and len(scales) > max_waves:
+            scales = scales[len(scales) - max_waves:]
+            opacities = opacities[len(opacities) - max_waves:]
+
+        # Draw main heart with pulsing
+        main_color = self.pulse_colors[255]
+        if prof:
+            prof.mark("geometry")
+        self.draw_heart("main", scale, main_color, 4, cycle[keyframe])
+        if prof:
+            prof.mark("draw")
+
+        # Draw expanding waves (older, faded ones first and with fewer
+        # vertices), each as one run of the waves layer
+        faded = [i for i, opacity in enumerate(opacities) if opacity <= 0.5]
+        bright = [i for i, opacity in enumerate(opacities) if opacity > 0.5]
+        groups = (
+            (faded, quality['faded_steps'], tolerance and tolerance * 2),
+            (bright, quality['wave_steps'], tolerance),
+        )
+        runs = []
+        for group, steps, group_tolerance in groups:
+            if not group:
+                continue
+            vertices = self.heart_vertices([scales[i] for i in group], steps, group_tolerance)
+            for i, wave_vertices in zip(group, vertices):
+                shade = int(opacities[i] * 255)
+                runs.append((wave_vertices, self.pulse_colors[shade], self.pulse_widths[shade]))
+        if prof:
+            prof.mark("geometry")
+        self.renderer.draw_runs("waves", runs)
+        if prof:
+            prof.mark("draw")
+        return len(runs)
+
+    def draw_still(self):
+        """Show the resting heart without waves"""
+        self.waves.clear()
+        self.renderer.clear("waves")
+        self.draw_heart("main", 1.0, self.get_pulse_color(1.0), 4)
+
+
+class CurveScene:
+    """The heart2.py equation curve with its glow and rainbow modes"""
+
+    def __init__(self, renderer, rainbow_bands=36):
+        self.renderer = renderer
+
+        # Glow under the main line. The three same-colored glow passes
+        # (widths 8, 6 and 4) look exactly like the widest one alone, so
+        # they are composited into a single layer drawn once at width 8
+        self.glow_widths = [8 - i*2 for i in range(3)]
+        renderer.add_layer("glow", width=max(self.glow_widths))
+        renderer.add_layer("main", width=3)
+
+        # Color variables
+        self.colors = ["#FF1493", "#FF69B4", "#FF0066", "#FF33CC", "#CC0099", "#FF1493"]
+        self.current_color_index = 0
+        self.rainbow_mode = False
+        self.glow_enabled = True
+        # Rainbow segments are quantized into this many hue bands (0: one hue
+        # per segment); each band is drawn as one multi-point line
+        self.rainbow_bands = rainbow_bands
+
+        # Computed curves keyed by (k, sampling, mode), shared by every redraw
+        self.geometry_cache = GeometryCache()
+
+    def get_rainbow_color(self, step, max_steps):
+        """Generate rainbow colors"""
+        hue = (step / max_steps) * 360
+        # Convert HSV to RGB (simplified)
+        c = 1
+        x = c * (1 - abs((hue / 60) % 2 - 1))
+        m = 0
+
+        if hue < 60:
+            r, g, b = c, x, 0
+        elif hue < 120:
+            r, g, b = x, c, 0
+        elif hue < 180:
+            r, g, b = 0, c, x
+        elif hue < 240:
+            r, g, b = 0, x, c
+        elif hue < 300:
+            r, g, b = x, 0, c
+        else:
+            r, g, b = c, 0, x
+
+        return f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
+
+    def rainbow_lut(self, total):
+        """Hex color of each of `total` rainbow segments, quantized into bands (cached)"""
+        bands = self.rainbow_bands
+
+        def compute():
+            if not bands or bands >= total:
+                return [self.get_rainbow_color(i, total) for i in range(total)]
+            # Every segment of a band gets the hue at the middle of the band
+            palette = [self.get_rainbow_color((band + 0.5) * total / bands, total)
+                       for band in range(bands)]
+            return [palette[i * bands // total] for i in range(total)]
+
+        return self.geometry_cache.get(("rainbow_lut", total, bands), compute)
+
+    def rainbow_runs(self, coords, total=None):
+        """Split a curve into runs of equal rainbow color"""
+        n = len(coords) // 2
+        if total is None:
+            total = n
+        lut = self.rainbow_lut(total)
+        runs = []
+        last = None
+        for i in range(1, n):
+            color = lut[i]
+            if color == last:
+                runs[-1][0].extend(coords[2*i:2*i + 2])
+            else:
+                runs.append((coords[2*i - 2:2*i + 2], color))
+                last = color
+        return runs
+
+    def compute_curve(self, k, sampling):
+        """Canvas coordinates of the curve for k with the given sampling"""
+        method, value = sampling
+        if method == "adaptive":
+            xs = heart_curves.equation_samples(k, value)
+            return heart_curves.canvas_coords(xs, heart_curves.heart_equation(xs, k), 100)
+        return heart_curves.equation_grid(value).coords(k, 100)
+
+    def curve_coords(self, k, sampling=("uniform", 300)):
+        """Canvas coordinates of the curve for k (cached)"""
+        return self.geometry_cache.get((k, sampling, "coords"),
+                                       lambda: self.compute_curve(k, sampling))
+
+    def curve_rainbow_runs(self, k, sampling=("uniform", 300)):
+        """Rainbow color runs of the curve for k (cached)"""
+        return self.geometry_cache.get((k, sampling, "rainbow"),
+                                       lambda: self.rainbow_runs(self.curve_coords(k, sampling)))
+
+    def line_color(self):
+        """Main line color outside rainbow mode"""
+        return self.colors[self.current_color_index]
+
+    def glow_color(self):
+        """Glow color (the same for every glow pass)"""
+        if self.rainbow_mode:
+            return "#FF1493"
+        return self.line_color()
+
+    def draw_curve(self, coords, total=None, runs=None, glow=True):
+        """Push a curve's coordinates onto the glow and main layers"""
+        if len(coords) < 4:
+            self.renderer.clear_all()
+            return
+
+        # Draw glow effect (left alone by the renderer unless the curve,
+        # its color or the glow setting changed)
+        if glow and self.glow_enabled:
+            self.renderer.draw("glow", coords, self.glow_color())
+        else:
+            self.renderer.clear("glow")
+
+        # Draw main heart
+        if self.rainbow_mode:
+            if runs is None:
+                runs = self.rainbow_runs(coords, total)
+            self.renderer.draw_runs("main", runs)
+        else:
+            self.renderer.draw("main", coords, self.line_color())
+
+    def draw_heart(self, k, sampling=("uniform", 300), glow=True):
+        """Draw the heart with given k value"""
+        runs = self.curve_rainbow_runs(k, sampling) if self.rainbow_mode else None
+        self.draw_curve(self.curve_coords(k, sampling), runs=runs, glow=glow)
+
+
+class HeartGrid:
+    """A wall of independently beating hearts, laid out in a grid
+
+    Every heart has its own BPM, phase, size and color. step() works out
+    all pulse sizes in one batch, recomputes vertices (one batch against a
+    shared unit curve) only for hearts whose size changed, and hands the
+    whole wall to the renderer as one layer. Hearts at rest keep their
+    vertex list, so the renderer skips them.
+    """
+
+    COLORS = ["#FF1493", "#FF69B4", "#FF0066", "#FF33CC", "#CC0099"]
+
+    def __init__(self, renderer, count, width, height, tolerance=0.5, seed=None):
+        self.renderer = renderer
+        self.count = count
+        rng = random.Random(seed)
+
+        # As square a grid as the area allows
+        columns = max(1, int(math.ceil(math.sqrt(count * width / height))))
+        rows = max(1, int(math.ceil(count / columns)))
+        cell = min(width / columns, height / rows)
+        self.centers_x = [(i % columns - (columns - 1) / 2) * cell for i in range(count)]
+        self.centers_y = [(i // columns - (rows - 1) / 2) * cell for i in range(count)]
+
+        self.bpms = [rng.randint(40, 150) for _ in range(count)]
+        self.phases = [rng.random() for _ in range(count)]
+        # Scale such that the largest pulse (1.4x) still fits the cell
+        fit = cell / (34 * 1.4)
+        self.scales = [fit * rng.uniform(0.6, 0.95) for _ in range(count)]
+        colors = [rng.choice(self.COLORS) for _ in range(count)]
+
+        # One parameter grid for all hearts, fine enough for the largest pulse
+        ts = heart_curves.corazon_samples(max(self.scales) * 1.4, tolerance)
+        unit = heart_curves.canvas_coords(*heart_curves.corazon(ts))
+        self.unit_x = unit[0::2]
+        # The heart spans y = -17 .. 5; shift it so it is centered in its cell
+        self.unit_y = [y - 6 for y in unit[1::2]]
+
+        renderer.add_layer("hearts", width=2 if cell >= 40 else 1)
+        self.time = 0.0
+        self.pulses = [None] * count
+        self.runs = [([], color) for color in colors]
+
+    def vertices(self, indices, sizes):
+        """Canvas coordinates of hearts `indices` at the given sizes, in one batch"""
+        if np is not None:
+            sizes = np.asarray(sizes, dtype=float)[:, None]
+            xs = sizes * np.asarray(self.unit_x) + np.asarray([self.centers_x[i] for i in indices])[:, None]
+            ys = sizes * np.asarray(self.unit_y) + np.asarray([self.centers_y[i] for i in indices])[:, None]
+            flat = np.empty((len(indices), 2 * len(self.unit_x)))
+            flat[:, 0::2] = xs
+            flat[:, 1::2] = ys
+            return flat.tolist()
+        rows = []
+        for i, size in zip(indices, sizes):
+            cx = self.centers_x[i]
+            cy = self.centers_y[i]
+            row = []
+            for x, y in zip(self.unit_x, self.unit_y):
+                row.append(cx + x * size)
+                row.append(cy + y * size)
+            rows.append(row)
+        return rows
+
+    def step(self, dt):
+        """Advance every heart by dt seconds and draw the wall; returns the hearts redrawn"""
+        self.time += dt
+        minutes = self.time / 60.0
+        pulses = beat_scales([(minutes * bpm + phase) % 1.0 for bpm, phase in zip(self.bpms, self.phases)])
+        if np is not None:
+            pulses = pulses.tolist()
+        changed = [i for i, (pulse, old) in enumerate(zip(pulses, self.pulses)) if pulse != old]
+        if changed:
+            rows = self.vertices(changed, [self.scales[i] * pulses[i] for i in changed])
+            # A new list each step: a pipelined frame keeps the one it was drawn with
+            self.runs = list(self.runs)
+            for i, row in zip(changed, rows):
+                self.runs[i] = (row, self.runs[i][1])
+            self.pulses = pulses
+        self.renderer.draw_runs("hearts", self.runs)
+        return len(changed)
+
+
+def nested_hearts(layers=15, points=None, scale_step=1.0, tolerance=0.5, stop=9.8):
+    """Canvas coordinates of heart.py's concentric hearts, smallest first
+
+    Heart i is drawn at scale i * scale_step over t = 0 .. stop. With
+    `points` every heart gets that many evenly spaced points (the original
+    drawing used 50); otherwise points are placed adaptively within
+    `tolerance` pixels. Hearts sharing a parameter grid are evaluated in
+    one batch. Like the turtle drawing, each heart starts with a line from
+    the origin to its first point.
+    """
+    scales = [i * scale_step for i in range(layers)]
+    if points is not None:
+        grids = [heart_curves.linspace(0.0, stop, max(1, points - 1))] * layers
+    else:
+        grids = [heart_curves.corazon_samples(scale, tolerance, 0.0, stop) for scale in scales]
+    groups = {}
+    for i, grid in enumerate(grids):
+        groups.setdefault(id(grid), (grid, []))[1].append(i)
+
+    hearts = [None] * layers
+    for grid, indices in groups.values():
+        # One unit heart per grid, scaled for every heart that uses it
+        unit = heart_curves.canvas_coords(*heart_curves.corazon(grid))
+        if np is not None:
+            rows = np.outer([scales[i] for i in indices], unit).tolist()
+        else:
+            rows = [[value * scales[i] for value in unit] for i in indices]
+        for i, row in zip(indices, rows):
+            hearts[i] = [0.0, 0.0] + row
+    return hearts
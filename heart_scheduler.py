@@ -0,0 +1,92 @@
+import time
+
+
+class FrameScheduler:
+    """Latest state wins: coalesce redraw requests into one render per frame
+
+    Input handlers only update state and call invalidate(). The render
+    callback runs once from an idle callback (and at most once every
+    min_interval_ms), receiving the set of things that were invalidated
+    since the previous render.
+    """
+
+    def __init__(self, root, render, min_interval_ms=0):
+        self.root = root
+        self.render = render
+        self.min_interval_ms = min_interval_ms
+        self.dirty = set()
+        self.pending = None
+        self.last_render = None
+
+    def invalidate(self, *what):
+        """Mark state dirty and make sure a render is scheduled"""
+        self.dirty.update(what or ("all",))
+        if self.pending is not None:
+            return
+        wait_ms = 0
+        if self.min_interval_ms and self.last_render is not None:
+            elapsed_ms = (time.perf_counter() - self.last_render) * 1000
+            wait_ms = int(self.min_interval_ms - elapsed_ms)
+        if wait_ms > 0:
+            self.pending = self.root.after(wait_ms, self._fire)
+        else:
+            self.pending = self.root.after_idle(self._fire)
+
+    def _fire(self):
+        self.pending = None
+        self.flush()
+
+    def flush(self):
+        """Render now if anything is dirty"""
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        if not self.dirty:
+            return
+        dirty = self.dirty
+        self.dirty = set()
+        self.last_render = time.perf_counter()
+        self.render(dirty)
+
+
+class FrameClock:
+    """Deadline-based frame pacing on the monotonic time.perf_counter() clock
+
+    Each frame calls tick(), which returns the real time elapsed since the
+    previous frame and how many frame slots were skipped because the frame
+    ran late. delay_ms() is the after() delay until the next deadline, so
+    the frame rate does not drift by the time spent rendering.
+    """
+
+    def __init__(self, fps=20):
+        self.frame_time = 1.0 / fps
+        self.deadline = None
+        self.last = None
+        self.dropped = 0
+        self.lateness = 0.0  # how late the current frame started, in seconds
+
+    def tick(self, now=None):
+        """Start a frame; returns (seconds since last frame, frames skipped)"""
+        if now is None:
+            now = time.perf_counter()
+        dt = 0.0 if self.last is None else now - self.last
+        self.last = now
+        if self.deadline is None:
+            self.deadline = now
+        self.lateness = max(0.0, now - self.deadline)
+        self.deadline += self.frame_time
+        skipped = 0
+        if now > self.deadline:
+            # Overran by whole frames: drop them instead of trying to catch up
+            skipped = int((now - self.deadline) / self.frame_time) + 1
+            self.deadline += skipped * self.frame_time
+            self.dropped += skipped
+        return dt, skipped
+
+    def delay_ms(self, now=None):
+        """Milliseconds from now until the next frame deadline"""
+        if now is None:
+            now = time.perf_counter()
+        if self.deadline is None:
+            return int(self.frame_time * 1000)
+        return max(1, int(round((self.deadline - now) * 1000)))
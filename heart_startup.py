@@ -0,0 +1,59 @@
+import math
+import sys
+import time
+
+# Startup support for heart1.py and heart2.py. The apps import this module
+# before anything else, so STARTED is as close to process start as Python
+# code gets. They paint a cheap first frame from the curves below as soon
+# as the canvas exists, and only then import NumPy and the scenes, build
+# the controls and draw the real frame.
+
+STARTED = time.perf_counter()
+
+# Time of each startup phase, in the order they were reached
+marks = {}
+
+
+def mark(phase):
+    """Record that a startup phase has finished"""
+    marks[phase] = time.perf_counter()
+
+
+def report(out=None):
+    """Write how long each phase took (for --measure-startup)"""
+    out = out or sys.stderr
+    previous = STARTED
+    for phase, at in marks.items():
+        out.write(f"{phase:<12} {(at - previous) * 1000:8.1f} ms\n")
+        previous = at
+    out.write(f"{'total':<12} {(previous - STARTED) * 1000:8.1f} ms\n")
+
+
+# First frames, computed with plain math at a fixed low resolution: no
+# NumPy, caches or adaptive sampling. The curves are the same ones as in
+# heart_curves (corazon_point and heart_equation_point).
+
+def resting_heart(points=64):
+    """heart1's heart at rest, as flat Canvas coordinates"""
+    coords = []
+    for i in range(points + 1):
+        t = 2 * math.pi * i / points
+        x = 16 * math.sin(t) ** 3
+        y = 13 * math.cos(t) - 5 * math.cos(2 * t) - 2 * math.cos(3 * t) - math.cos(4 * t)
+        coords.append(x * 4)
+        coords.append(y * -4)
+    return coords
+
+
+def equation_heart(k, steps=240, x_min=-1.8, x_max=1.8):
+    """heart2's curve for k, as flat Canvas coordinates"""
+    coords = []
+    for i in range(steps + 1):
+        x = x_min + (x_max - x_min) * i / steps
+        r = 3 - x * x
+        if r < 0:
+            continue
+        y = abs(x) ** (2 / 3) + 0.9 * math.sin(k * x) * math.sqrt(r)
+        coords.append(x * 100)
+        coords.append(y * -100)
+    return coords
@@ -0,0 +1,101 @@
+import tkinter as tk
+import time
+from heart_pipeline import FramePipeline, FrameRecorder, replay
+from heart_profiler import FrameProfiler
+from heart_render import CanvasRenderer
+from heart_scenes import HeartGrid
+from heart_scheduler import FrameClock
+
+# Wall display: a grid of independently beating hearts in one window, driven
+# by a single frame clock with one geometry batch and one flush per frame.
+
+
+class HeartWall:
+    def __init__(self, hearts=100, fps=30, width=1280, height=720, tolerance=0.5,
+                 seed=None, profile_log=None, pipeline=False):
+        self.root = tk.Tk()
+        self.root.title("💗 Heart Wall")
+        self.root.configure(bg='#000000')
+        
+        self.canvas = tk.Canvas(self.root, width=width, height=height, bg='#000000', highlightthickness=0)
+        self.canvas.pack()
+        
+        self.renderer = CanvasRenderer(self.canvas)
+        self.clock = FrameClock(fps)
+        # With the pipeline the wall is computed ahead on a worker thread
+        self.pipeline = None
+        if pipeline:
+            self.recorder = FrameRecorder()
+            self.scene = HeartGrid(self.recorder, hearts, width, height, tolerance, seed)
+            replay(self.recorder.take(), self.renderer)
+            self.pipeline = FramePipeline(self.produce_frame, 1.0 / fps)
+            self.pipeline.start()
+        else:
+            self.scene = HeartGrid(self.renderer, hearts, width, height, tolerance, seed)
+        
+        # Per-frame timings: F3 toggles the overlay, profile_log streams JSON lines
+        self.profiler = FrameProfiler(self.canvas, profile_log)
+        self.root.bind("<F3>", self.profiler.toggle_overlay)
+        
+        self.animate()
+    
+    def animate(self):
+        """Advance and draw every heart, then schedule the next frame"""
+        dt, skipped = self.clock.tick(time.perf_counter())
+        prof = self.profiler if self.profiler.enabled else None
+        if prof:
+            prof.begin("animate")
+            tk_calls = self.renderer.tk_calls
+        
+        redrawn = None
+        if self.pipeline is not None:
+            ops = self.pipeline.take()
+            if ops:
+                replay(ops, self.renderer)
+        else:
+            redrawn = self.scene.step(dt)
+        if prof:
+            prof.mark("draw")
+        self.renderer.update()
+        if prof:
+            prof.mark("update")
+            prof.end(tk_calls=self.renderer.tk_calls - tk_calls, hearts=redrawn,
+                     late_ms=round(self.clock.lateness * 1000, 3), dropped=skipped)
+        
+        self.root.after(self.clock.delay_ms(), self.animate)
+    
+    def produce_frame(self, target, dt):
+        """Compute the wall for time `target` (runs on the pipeline's worker thread)"""
+        self.scene.step(dt)
+        return self.recorder.take()
+    
+    def run(self):
+        """Start the application"""
+        try:
+            self.root.mainloop()
+        finally:
+            if self.pipeline is not None:
+                self.pipeline.stop()
+            self.profiler.close()
+
+# Run the application
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Wall of beating hearts")
+    parser.add_argument("--hearts", type=int, default=100, help="number of hearts")
+    parser.add_argument("--fps", type=int, default=30, help="target frame rate")
+    parser.add_argument("--width", type=int, default=1280, help="window width")
+    parser.add_argument("--height", type=int, default=720, help="window height")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="max distance in pixels between the drawn line and the curve")
+    parser.add_argument("--seed", type=int, help="seed for the hearts' BPMs, phases, sizes and colors")
+    parser.add_argument("--profile-log", help="append per-frame timings to this JSON-lines file")
+    parser.add_argument("--pipeline", action="store_true", help="compute frames ahead on a worker thread")
+    args = parser.parse_args()
+    if args.hearts < 1:
+        parser.error("--hearts must be at least 1")
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    if args.tolerance <= 0:
+        parser.error("--tolerance must be positive")
+    HeartWall(args.hearts, args.fps, args.width, args.height, args.tolerance,
+              args.seed, args.profile_log, args.pipeline).run()
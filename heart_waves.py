@@ -0,0 +1,71 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class WaveSystem:
+    """Expanding pulse waves stored as parallel arrays (struct of arrays)
+
+    Wave i has scales[i] and opacities[i]; waves are kept oldest first.
+    update() advances every wave in one batch and compacts away the ones
+    that faded out. When capacity is reached the oldest wave makes room
+    for the new one, so a new beat is never lost.
+    """
+
+    __slots__ = ('capacity', 'growth', 'fade', 'scales', 'opacities', 'dropped')
+
+    def __init__(self, capacity=64, growth=0.8, fade=0.4):
+        self.capacity = capacity
+        self.growth = growth  # scale gained per second
+        self.fade = fade  # opacity lost per second
+        self.dropped = 0
+        self.clear()
+
+    def __len__(self):
+        return len(self.scales)
+
+    def clear(self):
+        """Remove every wave"""
+        if np is not None:
+            self.scales = np.empty(0)
+            self.opacities = np.empty(0)
+        else:
+            self.scales = []
+            self.opacities = []
+
+    def spawn(self, scales, opacities):
+        """Add waves (sequences of start scales and opacities)"""
+        # The oldest waves that no longer fit ([-capacity:] would keep all at 0)
+        overflow = max(0, len(self.scales) + len(scales) - self.capacity)
+        self.dropped += overflow
+        if np is not None:
+            self.scales = np.concatenate((self.scales, scales))[overflow:]
+            self.opacities = np.concatenate((self.opacities, opacities))[overflow:]
+        else:
+            self.scales = (self.scales + list(scales))[overflow:]
+            self.opacities = (self.opacities + list(opacities))[overflow:]
+
+    def update(self, dt):
+        """Expand and fade every wave by dt seconds; returns how many faded out"""
+        grow = self.growth * dt
+        fade = self.fade * dt
+        count = len(self.scales)
+        if np is not None:
+            self.scales += grow
+            self.opacities -= fade
+            alive = self.opacities > 0
+            if not alive.all():
+                self.scales = self.scales[alive]
+                self.opacities = self.opacities[alive]
+        else:
+            scales = []
+            opacities = []
+            for scale, opacity in zip(self.scales, self.opacities):
+                opacity -= fade
+                if opacity > 0:
+                    scales.append(scale + grow)
+                    opacities.append(opacity)
+            self.scales = scales
+            self.opacities = opacities
+        return count - len(self.scales)